@@ -776,9 +776,7 @@ class ConversationalAI:
         # Get recent conversation history
         recent_history = context.conversation_history[-5:] if len(context.conversation_history) > 5 else context.conversation_history
 
-        history_text = ""
-        for msg in recent_history:
-            history_text += f"{msg['role'].title()}: {msg['content']}\n"
+        history_text = "".join(f"{msg['role'].title()}: {msg['content']}\n" for msg in recent_history)
 
         # Clean the user message to remove module context prefix
         clean_user_message = user_message
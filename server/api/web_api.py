@@ -5,9 +5,11 @@ FastAPI Web API for SafetyConnect Dashboard
 Provides REST endpoints for safety management dashboard KPIs and conversational AI
 """
 
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Sequence
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -22,7 +24,8 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main_app import SafetySummarizerApp
+from main_app import get_app
+from config.database_config import db_manager
 from ai_engine.conversational_ai import ConversationalAI
 from ai_engine.cache_manager import ai_cache
 
@@ -93,11 +96,114 @@ class ChartAddResponse(BaseModel):
     message: str
 
 # Initialize the main application
-summarizer_app = SafetySummarizerApp()
+summarizer_app = get_app()
 
 # Initialize conversational AI
 conversational_ai = ConversationalAI(summarizer_app)
 
+# Dashboard modules served by the combined KPI endpoints, in response order
+KPI_MODULES = ("incident_investigation", "action_tracking", "driver_safety_checklists", "observation_tracker",
+               "equipment_asset_management", "employee_training_fitness", "risk_assessment")
+
+# Key order of /metrics/all-safety-kpis' safety_dashboard_data
+DASHBOARD_MODULE_ORDER = ("incident_investigation", "driver_safety_checklists", "observation_tracker", "action_tracking",
+                          "equipment_asset_management", "employee_training_fitness", "risk_assessment")
+
+
+# KPIs reported per module in extraction_metadata.total_kpis
+MODULE_KPI_COUNTS = {
+    "incident_investigation": 13,  # 11 main + 2 insights
+    "driver_safety_checklists": 4,  # Daily/Weekly completion + Vehicle fitness + Overdue drivers
+    "observation_tracker": 4,  # By area + Status + Priority + Remarks insight
+    "action_tracking": 4,  # Actions created + % on time + Open/Closed + Overdue employees
+    "equipment_asset_management": 7,  # Calibration + Expiry + Inspection + Types + Insights
+    "employee_training_fitness": 8,  # Expired + Upcoming + Fitness + Medical + Department + Insights
+    "risk_assessment": 9  # 4 main KPIs + 5 insights
+}
+
+
+def parse_modules_param(modules: Optional[str]) -> List[str]:
+    """Turn a 'modules' query value ('all' or comma-separated names) into a module list
+
+    Raises HTTPException(400) for unknown module names.
+    """
+    if not modules or modules == "all":
+        return list(KPI_MODULES)
+    selected_modules = [m.strip() for m in modules.split(",") if m.strip()]
+    unknown_modules = [m for m in selected_modules if m not in KPI_MODULES]
+    if unknown_modules or not selected_modules:
+        invalid = ", ".join(unknown_modules) if unknown_modules else repr(modules)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown module(s): {invalid}. Valid modules: {', '.join(KPI_MODULES)} (or 'all')"
+        )
+    return selected_modules
+
+
+def _module_kpi_tasks(customer_id: Optional[str], days_back: int,
+                      start_date: datetime, end_date: datetime) -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """KPI extraction call for each dashboard module, in response order"""
+    return {
+        "incident_investigation": lambda: summarizer_app.incident_extractor.get_all_incident_kpis(
+            customer_id=customer_id, start_date=start_date, end_date=end_date
+        ),
+        "action_tracking": lambda: summarizer_app.action_extractor.get_all_action_tracking_kpis(
+            customer_id=customer_id, start_date=start_date, end_date=end_date
+        ),
+        "driver_safety_checklists": lambda: summarizer_app.driver_safety_extractor.get_driver_safety_checklist_kpis(
+            customer_id=customer_id, days_back=days_back
+        ),
+        "observation_tracker": lambda: summarizer_app.observation_tracker_extractor.get_observation_tracker_kpis(
+            customer_id=customer_id, days_back=days_back
+        ),
+        "equipment_asset_management": lambda: summarizer_app.equipment_asset_extractor.get_equipment_asset_kpis(
+            customer_id=customer_id, days_back=days_back
+        ),
+        "employee_training_fitness": lambda: summarizer_app.employee_training_extractor.get_employee_training_kpis(
+            customer_id=customer_id, days_back=days_back
+        ),
+        "risk_assessment": lambda: summarizer_app.risk_assessment_extractor.get_risk_assessment_kpis(
+            customer_id=customer_id, days_back=days_back
+        )
+    }
+
+
+def _run_module_kpi_task(module_name: str, task: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one module's extraction, turning a failure into an error dict for that module only"""
+    try:
+        return task()
+    except Exception as e:
+        logger.error(f"Error extracting {module_name} KPIs: {str(e)}")
+        return {"error": str(e)}
+    finally:
+        # Worker threads are short-lived; release the scoped session this thread may have opened
+        db_manager.Session.remove()
+
+
+def fetch_module_kpis(selected_modules: Sequence[str], customer_id: Optional[str], days_back: int,
+                      start_date: datetime, end_date: datetime) -> Dict[str, Dict[str, Any]]:
+    """Extract KPIs for the selected modules concurrently, one worker (and DB session) per module"""
+    tasks = {name: task for name, task in _module_kpi_tasks(customer_id, days_back, start_date, end_date).items()
+             if name in selected_modules}
+    if not tasks:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(_run_module_kpi_task, name, task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Write JSON to a temp file next to path, then rename it over path so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -330,9 +436,13 @@ async def get_risk_assessment_kpis(
 @app.get("/metrics/all-safety-kpis")
 async def get_all_safety_kpis(
     customer_id: Optional[str] = Query(None, description="Customer ID filter"),
-    days_back: int = Query(365, description="Number of days to look back")
+    days_back: int = Query(365, description="Number of days to look back"),
+    modules: Optional[str] = Query("all", description="Comma-separated list of modules or 'all'")
 ):
-    """Get all safety KPIs for the comprehensive dashboard"""
+    """Get all safety KPIs for the comprehensive dashboard (or only the requested modules)"""
+    # Validate outside the try so a bad module name is a 400, not a 500
+    selected_modules = parse_modules_param(modules)
+
     try:
         logger.info(f"Generating all safety KPIs for customer: {customer_id}")
 
@@ -341,66 +451,19 @@ async def get_all_safety_kpis(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
 
-        # Fetch all KPIs from the 4 core modules using correct method names
-        incident_kpis = summarizer_app.incident_extractor.get_all_incident_kpis(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        action_kpis = summarizer_app.action_extractor.get_all_action_tracking_kpis(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        driver_safety_kpis = summarizer_app.driver_safety_extractor.get_driver_safety_checklist_kpis(
-            customer_id=customer_id,
-            days_back=days_back
-        )
-
-        observation_kpis = summarizer_app.observation_tracker_extractor.get_observation_tracker_kpis(
-            customer_id=customer_id,
-            days_back=days_back
-        )
-
-        equipment_asset_kpis = summarizer_app.equipment_asset_extractor.get_equipment_asset_kpis(
-            customer_id=customer_id,
-            days_back=days_back
-        )
-
-        employee_training_kpis = summarizer_app.employee_training_extractor.get_employee_training_kpis(
-            customer_id=customer_id,
-            days_back=days_back
-        )
-
-        risk_assessment_kpis = summarizer_app.risk_assessment_extractor.get_risk_assessment_kpis(
-            customer_id=customer_id,
-            days_back=days_back
-        )
+        # Fetch KPIs for the selected modules only, independent extractors in parallel
+        module_kpis = fetch_module_kpis(selected_modules, customer_id, days_back, start_date, end_date)
 
         # Combine all KPIs into a comprehensive response
         combined_response = {
             "safety_dashboard_data": {
-                "incident_investigation": incident_kpis,
-                "driver_safety_checklists": driver_safety_kpis,
-                "observation_tracker": observation_kpis,
-                "action_tracking": action_kpis,
-                "equipment_asset_management": equipment_asset_kpis,
-                "employee_training_fitness": employee_training_kpis,
-                "risk_assessment": risk_assessment_kpis
+                module: module_kpis[module] for module in DASHBOARD_MODULE_ORDER if module in module_kpis
             },
             "extraction_metadata": {
                 "extraction_timestamp": datetime.now().isoformat(),
-                "modules_extracted": 7,
+                "modules_extracted": len(module_kpis),
                 "total_kpis": {
-                    "incident_investigation": 13,  # 11 main + 2 insights
-                    "driver_safety_checklists": 4,  # Daily/Weekly completion + Vehicle fitness + Overdue drivers
-                    "observation_tracker": 4,  # By area + Status + Priority + Remarks insight
-                    "action_tracking": 4,  # Actions created + % on time + Open/Closed + Overdue employees
-                    "equipment_asset_management": 7,  # Calibration + Expiry + Inspection + Types + Insights
-                    "employee_training_fitness": 8,  # Expired + Upcoming + Fitness + Medical + Department + Insights
-                    "risk_assessment": 9  # 4 main KPIs + 5 insights
+                    module: MODULE_KPI_COUNTS[module] for module in DASHBOARD_MODULE_ORDER if module in module_kpis
                 },
                 "template_ids": {
                     "driver_safety_checklists": "a35be57e-dd36-4a21-b05b-e4d4fa836f53",
@@ -1239,56 +1302,18 @@ async def get_comprehensive_ai_analysis(
     modules: Optional[str] = Query("all", description="Comma-separated list of modules or 'all'")
 ):
     """Get comprehensive analysis across all or selected modules"""
+    # Validate outside the try so a bad module name is a 400, not a 500
+    selected_modules = parse_modules_param(modules)
+
     try:
         logger.info(f"Generating comprehensive analysis for customer: {customer_id}")
 
-        # Parse modules parameter
-        if modules == "all":
-            selected_modules = ["incident_investigation", "action_tracking", "driver_safety_checklists", "observation_tracker", "equipment_asset_management", "employee_training_fitness", "risk_assessment"]
-        else:
-            selected_modules = [m.strip() for m in modules.split(",")]
-
         # Get dashboard data for all selected modules
         from datetime import timedelta
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
 
-        all_dashboard_data = {}
-
-        if "incident_investigation" in selected_modules:
-            all_dashboard_data["incident_investigation"] = summarizer_app.incident_extractor.get_all_incident_kpis(
-                customer_id=customer_id, start_date=start_date, end_date=end_date
-            )
-
-        if "action_tracking" in selected_modules:
-            all_dashboard_data["action_tracking"] = summarizer_app.action_extractor.get_all_action_tracking_kpis(
-                customer_id=customer_id, start_date=start_date, end_date=end_date
-            )
-
-        if "driver_safety_checklists" in selected_modules:
-            all_dashboard_data["driver_safety_checklists"] = summarizer_app.driver_safety_extractor.get_driver_safety_checklist_kpis(
-                customer_id=customer_id, days_back=days_back
-            )
-
-        if "observation_tracker" in selected_modules:
-            all_dashboard_data["observation_tracker"] = summarizer_app.observation_tracker_extractor.get_observation_tracker_kpis(
-                customer_id=customer_id, days_back=days_back
-            )
-
-        if "equipment_asset_management" in selected_modules:
-            all_dashboard_data["equipment_asset_management"] = summarizer_app.equipment_asset_extractor.get_equipment_asset_kpis(
-                customer_id=customer_id, days_back=days_back
-            )
-
-        if "employee_training_fitness" in selected_modules:
-            all_dashboard_data["employee_training_fitness"] = summarizer_app.employee_training_extractor.get_employee_training_kpis(
-                customer_id=customer_id, days_back=days_back
-            )
-
-        if "risk_assessment" in selected_modules:
-            all_dashboard_data["risk_assessment"] = summarizer_app.risk_assessment_extractor.get_risk_assessment_kpis(
-                customer_id=customer_id, days_back=days_back
-            )
+        all_dashboard_data = fetch_module_kpis(selected_modules, customer_id, days_back, start_date, end_date)
 
         # Get comprehensive AI analysis if requested
         comprehensive_ai_analysis = None
@@ -1376,8 +1401,7 @@ async def save_dashboard_config(request: DashboardConfigRequest):
         }
 
         config_path = os.path.join(dashboards_dir, f"{dashboard_id}.json")
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        write_json_atomic(config_path, config)
 
         return DashboardConfigResponse(
             success=True,
@@ -1441,8 +1465,7 @@ async def add_chart_to_dashboard(request: ChartAddRequest):
         }
 
         chart_path = os.path.join(charts_dir, f"{chart_id}.json")
-        with open(chart_path, 'w') as f:
-            json.dump(chart_config, f, indent=2)
+        write_json_atomic(chart_path, chart_config)
 
         return ChartAddResponse(
             success=True,
@@ -1686,52 +1709,33 @@ async def generate_more_insights(request_data: dict):
         logger.error(f"Error generating more insights: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Insights module slug -> (summarizer_app extractor attribute, KPI method, days back, takes start/end dates)
+INSIGHTS_MODULE_SOURCES = {
+    'incident-investigation': ("incident_extractor", "get_all_incident_kpis", 30, True),
+    'action-tracking': ("action_extractor", "get_all_action_tracking_kpis", 30, True),
+    'driver-safety': ("driver_safety_extractor", "get_driver_safety_checklist_kpis", 30, False),
+    'observation-tracker': ("observation_tracker_extractor", "get_observation_tracker_kpis", 30, False),
+    'equipment-asset': ("equipment_asset_extractor", "get_equipment_asset_kpis", 30, False),
+    'employee-training': ("employee_training_extractor", "get_employee_training_kpis", 365, False),
+    'risk-assessment': ("risk_assessment_extractor", "get_risk_assessment_kpis", 30, False)
+}
+
 async def get_module_data_for_insights(module: str):
     """Get fresh module data for generating insights"""
     try:
-        from datetime import datetime, timedelta
+        source = INSIGHTS_MODULE_SOURCES.get(module)
+        if source is None:
+            return None
 
-        if module == 'incident-investigation':
-            # Use the correct method name: get_all_incident_kpis
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            return summarizer_app.incident_extractor.get_all_incident_kpis(
-                customer_id=None, start_date=start_date, end_date=end_date
-            )
-        elif module == 'action-tracking':
-            # Use the correct method name: get_all_action_tracking_kpis
+        # Resolve the extractor at call time so lazily created extractors stay lazy
+        extractor_attr, method_name, days_back, uses_date_range = source
+        get_kpis = getattr(getattr(summarizer_app, extractor_attr), method_name)
+
+        if uses_date_range:
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            return summarizer_app.action_extractor.get_all_action_tracking_kpis(
-                customer_id=None, start_date=start_date, end_date=end_date
-            )
-        elif module == 'driver-safety':
-            # Use the correct method name: get_driver_safety_checklist_kpis
-            return summarizer_app.driver_safety_extractor.get_driver_safety_checklist_kpis(
-                customer_id=None, days_back=30
-            )
-        elif module == 'observation-tracker':
-            # Use the correct method name: get_observation_tracker_kpis
-            return summarizer_app.observation_tracker_extractor.get_observation_tracker_kpis(
-                customer_id=None, days_back=30
-            )
-        elif module == 'equipment-asset':
-            # Use the correct method name: get_equipment_asset_kpis
-            return summarizer_app.equipment_asset_extractor.get_equipment_asset_kpis(
-                customer_id=None, days_back=30
-            )
-        elif module == 'employee-training':
-            # Use the correct method name: get_employee_training_kpis
-            return summarizer_app.employee_training_extractor.get_employee_training_kpis(
-                customer_id=None, days_back=365
-            )
-        elif module == 'risk-assessment':
-            # Use the correct method name: get_risk_assessment_kpis
-            return summarizer_app.risk_assessment_extractor.get_risk_assessment_kpis(
-                customer_id=None, days_back=30
-            )
-        else:
-            return None
+            start_date = end_date - timedelta(days=days_back)
+            return get_kpis(customer_id=None, start_date=start_date, end_date=end_date)
+        return get_kpis(customer_id=None, days_back=days_back)
     except Exception as e:
         logger.error(f"Error getting module data for {module}: {str(e)}")
         return None
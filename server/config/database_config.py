@@ -7,7 +7,7 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 import sqlalchemy as sa
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 import logging
@@ -48,6 +48,10 @@ class DatabaseManager:
 
         self._process_safety_engine = None
         self._process_safety_session = None
+        # Session factory bound to the current engine; rebuilt when the engine is reset
+        self._session_factory = None
+        # Thread-local sessions: Session() is this thread's session, Session.remove() discards it
+        self.Session = scoped_session(self._new_session)
 
         logger.info(f"Database config initialized for ProcessSafety: {self.process_safety_config.host}:{self.process_safety_config.port}/{self.process_safety_config.database}")
 
@@ -82,9 +86,8 @@ class DatabaseManager:
 
         while retry_count < max_retries:
             try:
-                # Always create a new session to avoid transaction issues
-                Session = sessionmaker(bind=self.process_safety_engine, autoflush=False, autocommit=False)
-                session = Session()
+                # Always create a new session to avoid transaction issues (connections come from the engine's pool)
+                session = self._get_session_factory()()
 
                 # Test the connection with a simple query
                 result = session.execute(sa.text("SELECT 1"))
@@ -119,6 +122,59 @@ class DatabaseManager:
                 import time
                 time.sleep(1)
 
+    def _get_session_factory(self):
+        """Return the sessionmaker for the current engine, creating it once per engine"""
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(bind=self.process_safety_engine, autoflush=False, autocommit=False)
+        return self._session_factory
+
+    def get_scoped_session(self):
+        """Return the thread-local Session registry after validating this thread's connection, with retry logic"""
+        max_retries = 3
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                result = self.Session.execute(sa.text("SELECT 1"))
+                result.fetchone()
+                logger.info("ProcessSafety scoped database session created successfully")
+                return self.Session
+            except Exception as e:
+                retry_count += 1
+                error_msg = str(e)
+                logger.warning(f"Failed to create ProcessSafety scoped session (attempt {retry_count}/{max_retries}): {error_msg}")
+
+                # Drop the broken session so the next attempt (and later callers) start clean
+                try:
+                    self.Session.remove()
+                except Exception:
+                    pass
+
+                if retry_count >= max_retries:
+                    logger.error(f"Failed to create ProcessSafety scoped session after {max_retries} attempts")
+                    raise
+
+                # Reset engine on connection failure to force reconnection
+                if self._is_connection_error(error_msg):
+                    logger.info("Resetting database engine due to connection issue")
+                    self._reset_engine()
+
+                # Wait before retry
+                import time
+                time.sleep(1)
+
+    def _new_session(self):
+        """Create a session on the current engine (used by the scoped Session registry)"""
+        return self._get_session_factory()()
+
+    def refresh_session(self, session):
+        """Replace a broken session: the scoped registry just drops this thread's session, others get a fresh one"""
+        if session is self.Session:
+            self.Session.remove()
+            return self.Session
+        self.cleanup_session(session)
+        return self.create_fresh_session()
+
     def _is_connection_error(self, error_msg: str) -> bool:
         """Check if error is related to database connection"""
         connection_indicators = [
@@ -139,6 +195,7 @@ class DatabaseManager:
             if self._process_safety_engine:
                 self._process_safety_engine.dispose()
                 self._process_safety_engine = None
+            self._session_factory = None
             logger.info("Database engine reset successfully")
         except Exception as e:
             logger.error(f"Error resetting database engine: {str(e)}")
@@ -221,12 +278,14 @@ class DatabaseManager:
 
     def close_connections(self):
         """Close database connections"""
+        self.Session.remove()
         if self._process_safety_session:
             self.cleanup_session(self._process_safety_session)
             self._process_safety_session = None
         if self._process_safety_engine:
             self._process_safety_engine.dispose()
             self._process_safety_engine = None
+        self._session_factory = None
         logger.info("Database connections closed")
 
 # Global database manager instance
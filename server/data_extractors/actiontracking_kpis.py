@@ -22,6 +22,8 @@ Database Schema:
 """
 
 import logging
+from itertools import chain
+from operator import itemgetter
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from sqlalchemy import text
@@ -30,6 +32,14 @@ import json
 
 logger = logging.getLogger(__name__)
 
+_SQL_ACTION_SUBTAG_IDS = text("""
+    SELECT DISTINCT pst.id
+    FROM "ProcessSafetySubTags" pst
+    JOIN "ProcessSafetyTags" pt ON pst."tagId" = pt.id
+    WHERE LOWER(pt."tagName") LIKE '%action%'
+    AND (pst."isDeleted" = false OR pst."isDeleted" IS NULL)
+""")
+
 
 class ActionTrackingKPIsExtractor:
     """Extract Action Tracking KPIs from ProcessSafety tables"""
@@ -56,12 +66,8 @@ class ActionTrackingKPIsExtractor:
             from config.database_config import db_manager
             logger.info("Recreating database session due to connection issue")
 
-            # Clean up current session if it exists
-            if self.db_session:
-                db_manager.cleanup_session(self.db_session)
-
-            # Get fresh session
-            self.db_session = db_manager.create_fresh_session()
+            # Clean up the current session and get a fresh one
+            self.db_session = db_manager.refresh_session(self.db_session)
             logger.info("Database session recreated successfully")
             return True
         except Exception as e:
@@ -114,15 +120,7 @@ class ActionTrackingKPIsExtractor:
 
         try:
             # Filter by Action Tracking module using tag name
-            query = text("""
-                SELECT DISTINCT pst.id
-                FROM "ProcessSafetySubTags" pst
-                JOIN "ProcessSafetyTags" pt ON pst."tagId" = pt.id
-                WHERE LOWER(pt."tagName") LIKE '%action%'
-                AND (pst."isDeleted" = false OR pst."isDeleted" IS NULL)
-            """)
-
-            result = self._execute_query_safely(query)
+            result = self._execute_query_safely(_SQL_ACTION_SUBTAG_IDS)
             self._action_tracking_subtag_ids = [row[0] for row in result.fetchall()]
 
             logger.info(f"Found {len(self._action_tracking_subtag_ids)} action tracking subTagIds")
@@ -132,12 +130,66 @@ class ActionTrackingKPIsExtractor:
             logger.error(f"Error getting action tracking subTagIds: {str(e)}")
             return []
 
+    def _get_action_counts(self, subtag_ids_tuple: tuple, start_date: datetime,
+                           end_date: datetime) -> Dict[str, int]:
+        """
+        Get open, closed and on-time action counts in a single scan
+
+        The created, on-time and open-vs-closed KPIs all count the same schedules + histories
+        rows, so they share one aggregate using FILTER clauses instead of separate COUNT queries.
+        """
+        counts_query = text(f"""
+            WITH all_actions AS (
+                -- Actions from schedules table (open actions)
+                SELECT
+                    ps."attribute",
+                    'open' as status
+                FROM "ProcessSafetySchedules" ps
+                WHERE ps."subTagId" IN {subtag_ids_tuple}
+                AND ps."createdAt" >= :start_date
+                AND ps."createdAt" <= :end_date
+
+                UNION ALL
+
+                -- Actions from histories table (closed actions)
+                SELECT
+                    ph."attribute",
+                    'closed' as status
+                FROM "ProcessSafetyHistories" ph
+                WHERE ph."subTagId" IN {subtag_ids_tuple}
+                AND ph."createdAt" >= :start_date
+                AND ph."createdAt" <= :end_date
+            )
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'open') as schedules_count,
+                COUNT(*) FILTER (WHERE status = 'closed') as histories_count,
+                COUNT(*) FILTER (
+                    WHERE "attribute"::jsonb->>'additionalStatus' = 'SUBMITTED_ON_TIME'
+                ) as completed_on_time
+            FROM all_actions
+        """)
+
+        params = {
+            "start_date": start_date,
+            "end_date": end_date
+        }
+
+        row = self._execute_query_safely(counts_query, params).fetchone()
+
+        return {
+            "schedules_count": row[0] or 0,
+            "histories_count": row[1] or 0,
+            "completed_on_time": row[2] or 0
+        }
+
     def get_number_of_actions_created(self, customer_id: Optional[str] = None,
                                     start_date: Optional[datetime] = None,
-                                    end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                                    end_date: Optional[datetime] = None,
+                                    counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """
         Get number of actions created - count of rows in schedules + histories tables
         filtered by subTagId for action tracking module
+        Pass counts from _get_action_counts to skip the query
         """
         try:
             # Set default date range if not provided
@@ -159,37 +211,11 @@ class ActionTrackingKPIsExtractor:
                     }
                 }
 
-            # Convert list to tuple for SQL IN clause
-            subtag_ids_tuple = tuple(action_subtag_ids)
+            if counts is None:
+                counts = self._get_action_counts(tuple(action_subtag_ids), start_date, end_date)
 
-            # Count actions in schedules table (open actions)
-            schedules_query = text(f"""
-                SELECT COUNT(*) 
-                FROM "ProcessSafetySchedules" ps
-                WHERE ps."subTagId" IN {subtag_ids_tuple}
-                AND ps."createdAt" >= :start_date
-                AND ps."createdAt" <= :end_date
-            """)
-
-            # Count actions in histories table (closed actions)
-            histories_query = text(f"""
-                SELECT COUNT(*) 
-                FROM "ProcessSafetyHistories" ph
-                WHERE ph."subTagId" IN {subtag_ids_tuple}
-                AND ph."createdAt" >= :start_date
-                AND ph."createdAt" <= :end_date
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-            
-            schedules_result = self.db_session.execute(schedules_query, params)
-            schedules_count = schedules_result.fetchone()[0]
-
-            histories_result = self.db_session.execute(histories_query, params)
-            histories_count = histories_result.fetchone()[0]
+            schedules_count = counts["schedules_count"]
+            histories_count = counts["histories_count"]
 
             total_actions = schedules_count + histories_count
 
@@ -219,11 +245,13 @@ class ActionTrackingKPIsExtractor:
 
     def get_percentage_of_actions_completed_on_time(self, customer_id: Optional[str] = None,
                                                   start_date: Optional[datetime] = None,
-                                                  end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                                                  end_date: Optional[datetime] = None,
+                                                  counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """
         Get percentage of actions completed on time
         Actions completed on time are where "attribute" column has key "additionalStatus" = "SUBMITTED_ON_TIME"
         % of actions completed on time = (completed actions / total actions) * 100
+        Pass counts from _get_action_counts to skip the query
         """
         try:
             # Set default date range if not provided
@@ -245,51 +273,11 @@ class ActionTrackingKPIsExtractor:
                     }
                 }
 
-            # Convert list to tuple for SQL IN clause
-            subtag_ids_tuple = tuple(action_subtag_ids)
-
-            # Query both schedules and histories tables for total actions and on-time completions
-            combined_query = text(f"""
-                WITH all_actions AS (
-                    -- Actions from schedules table (open actions)
-                    SELECT
-                        ps."attribute",
-                        'open' as status
-                    FROM "ProcessSafetySchedules" ps
-                    WHERE ps."subTagId" IN {subtag_ids_tuple}
-                    AND ps."createdAt" >= :start_date
-                    AND ps."createdAt" <= :end_date
-
-                    UNION ALL
-
-                    -- Actions from histories table (closed actions)
-                    SELECT
-                        ph."attribute",
-                        'closed' as status
-                    FROM "ProcessSafetyHistories" ph
-                    WHERE ph."subTagId" IN {subtag_ids_tuple}
-                    AND ph."createdAt" >= :start_date
-                    AND ph."createdAt" <= :end_date
-                )
-                SELECT
-                    COUNT(*) as total_actions,
-                    COUNT(CASE
-                        WHEN "attribute"::jsonb->>'additionalStatus' = 'SUBMITTED_ON_TIME'
-                        THEN 1
-                    END) as completed_on_time
-                FROM all_actions
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            result = self.db_session.execute(combined_query, params)
-            row = result.fetchone()
+            if counts is None:
+                counts = self._get_action_counts(tuple(action_subtag_ids), start_date, end_date)
 
-            total_actions = row[0] if row[0] else 0
-            completed_on_time = row[1] if row[1] else 0
+            total_actions = counts["schedules_count"] + counts["histories_count"]
+            completed_on_time = counts["completed_on_time"]
 
             # Calculate percentage
             percentage_completed_on_time = (completed_on_time / total_actions * 100) if total_actions > 0 else 0.0
@@ -320,11 +308,13 @@ class ActionTrackingKPIsExtractor:
 
     def get_open_vs_closed_actions(self, customer_id: Optional[str] = None,
                                  start_date: Optional[datetime] = None,
-                                 end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                                 end_date: Optional[datetime] = None,
+                                 counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """
         Get open vs closed actions
         Open actions are actions that exist in schedules table
         Closed actions are actions that exist in histories table
+        Pass counts from _get_action_counts to skip the query
         """
         try:
             # Set default date range if not provided
@@ -348,37 +338,11 @@ class ActionTrackingKPIsExtractor:
                     }
                 }
 
-            # Convert list to tuple for SQL IN clause
-            subtag_ids_tuple = tuple(action_subtag_ids)
+            if counts is None:
+                counts = self._get_action_counts(tuple(action_subtag_ids), start_date, end_date)
 
-            # Count open actions in schedules table
-            open_actions_query = text(f"""
-                SELECT COUNT(*)
-                FROM "ProcessSafetySchedules" ps
-                WHERE ps."subTagId" IN {subtag_ids_tuple}
-                AND ps."createdAt" >= :start_date
-                AND ps."createdAt" <= :end_date
-            """)
-
-            # Count closed actions in histories table
-            closed_actions_query = text(f"""
-                SELECT COUNT(*)
-                FROM "ProcessSafetyHistories" ph
-                WHERE ph."subTagId" IN {subtag_ids_tuple}
-                AND ph."createdAt" >= :start_date
-                AND ph."createdAt" <= :end_date
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            open_result = self.db_session.execute(open_actions_query, params)
-            open_actions = open_result.fetchone()[0]
-
-            closed_result = self.db_session.execute(closed_actions_query, params)
-            closed_actions = closed_result.fetchone()[0]
+            open_actions = counts["schedules_count"]
+            closed_actions = counts["histories_count"]
 
             total_actions = open_actions + closed_actions
 
@@ -449,19 +413,29 @@ class ActionTrackingKPIsExtractor:
             subtag_ids_tuple = tuple(action_subtag_ids)
 
             # Query for overdue actions from schedules table
+            # Overdue rows are counted per user first, then joined to at most one UserProfiles row per user
+            # (LATERAL ... LIMIT 1) so duplicate profile rows can't double a user's overdue count
             schedules_query = text(f"""
-                SELECT DISTINCT
-                    ps."userId",
+                SELECT
+                    oc."userId",
                     up."name" as user_name,
                     up."department",
-                    COUNT(*) as overdue_count
-                FROM "ProcessSafetySchedules" ps
-                LEFT JOIN "UserProfiles" up ON ps."userId" = up."userId"
-                WHERE ps."subTagId" IN {subtag_ids_tuple}
-                AND ps."createdAt" >= :start_date
-                AND ps."createdAt" <= :end_date
-                AND ps."attribute"::jsonb->>'additionalStatus' = 'OVERDUE'
-                GROUP BY ps."userId", up."name", up."department"
+                    oc.overdue_count
+                FROM (
+                    SELECT ps."userId", COUNT(*) as overdue_count
+                    FROM "ProcessSafetySchedules" ps
+                    WHERE ps."subTagId" IN {subtag_ids_tuple}
+                    AND ps."createdAt" >= :start_date
+                    AND ps."createdAt" <= :end_date
+                    AND ps."attribute"::jsonb->>'additionalStatus' = 'OVERDUE'
+                    GROUP BY ps."userId"
+                ) oc
+                LEFT JOIN LATERAL (
+                    SELECT p."name", p."department"
+                    FROM "UserProfiles" p
+                    WHERE p."userId" = oc."userId"
+                    LIMIT 1
+                ) up ON true
             """)
 
             # Query for overdue actions from histories table
@@ -492,15 +466,24 @@ class ActionTrackingKPIsExtractor:
                     FROM unnested_users uu
                     WHERE uu.user_json_string::jsonb->>'associatedId' IS NOT NULL
                     AND uu.user_json_string::jsonb->>'idType' = 'userId'
+                ),
+                overdue_counts AS (
+                    SELECT pu.user_id, COUNT(*) as overdue_count
+                    FROM parsed_users pu
+                    GROUP BY pu.user_id
                 )
-                SELECT DISTINCT
-                    pu.user_id,
+                SELECT
+                    oc.user_id,
                     up."name" as user_name,
                     up."department",
-                    COUNT(*) as overdue_count
-                FROM parsed_users pu
-                LEFT JOIN "UserProfiles" up ON pu.user_id = up."userId"
-                GROUP BY pu.user_id, up."name", up."department"
+                    oc.overdue_count
+                FROM overdue_counts oc
+                LEFT JOIN LATERAL (
+                    SELECT p."name", p."department"
+                    FROM "UserProfiles" p
+                    WHERE p."userId" = oc.user_id
+                    LIMIT 1
+                ) up ON true
             """)
 
             params = {
@@ -523,43 +506,28 @@ class ActionTrackingKPIsExtractor:
                 self.db_session.rollback()
                 logger.info("Skipping histories table for overdue employees due to data structure issues")
 
-            # Combine and aggregate results
+            # Combine and aggregate results from both tables in a single pass
             employee_overdue_map = {}
             total_overdue_actions = 0
 
-            # Process schedules data
-            for row in schedules_data:
-                user_id, user_name, department, overdue_count = row
-                if user_id:
-                    key = str(user_id)
-                    if key not in employee_overdue_map:
-                        employee_overdue_map[key] = {
-                            "user_id": str(user_id),
-                            "user_name": user_name or "Unknown",
-                            "department": department or "Unknown",
-                            "overdue_actions_count": 0
-                        }
-                    employee_overdue_map[key]["overdue_actions_count"] += overdue_count
-                    total_overdue_actions += overdue_count
-
-            # Process histories data
-            for row in histories_data:
-                user_id, user_name, department, overdue_count = row
-                if user_id:
-                    key = str(user_id)
-                    if key not in employee_overdue_map:
-                        employee_overdue_map[key] = {
-                            "user_id": str(user_id),
-                            "user_name": user_name or "Unknown",
-                            "department": department or "Unknown",
-                            "overdue_actions_count": 0
-                        }
-                    employee_overdue_map[key]["overdue_actions_count"] += overdue_count
-                    total_overdue_actions += overdue_count
+            for user_id, user_name, department, overdue_count in chain(schedules_data, histories_data):
+                if not user_id:
+                    continue
+                key = str(user_id)
+                employee = employee_overdue_map.get(key)
+                if employee is None:
+                    employee = employee_overdue_map[key] = {
+                        "user_id": key,
+                        "user_name": user_name or "Unknown",
+                        "department": department or "Unknown",
+                        "overdue_actions_count": 0
+                    }
+                employee["overdue_actions_count"] += overdue_count
+                total_overdue_actions += overdue_count
 
             # Convert to list and sort by overdue count (descending)
             overdue_employees = list(employee_overdue_map.values())
-            overdue_employees.sort(key=lambda x: x["overdue_actions_count"], reverse=True)
+            overdue_employees.sort(key=itemgetter("overdue_actions_count"), reverse=True)
 
             return {
                 "overdue_employees": overdue_employees,
@@ -594,10 +562,27 @@ class ActionTrackingKPIsExtractor:
         try:
             logger.info("Extracting all Action Tracking KPIs and insights...")
 
+            # Set default date range so the shared counts and each KPI cover the same window
+            if not end_date:
+                end_date = datetime.now()
+            if not start_date:
+                start_date = end_date - timedelta(days=365)  # Last year
+
+            # Count open, closed and on-time actions once for the three count-based KPIs; if that fails,
+            # each KPI falls back to its own query and error handling
+            counts = None
+            try:
+                action_subtag_ids = self._get_action_tracking_subtag_ids(customer_id)
+                if action_subtag_ids:
+                    counts = self._get_action_counts(tuple(action_subtag_ids), start_date, end_date)
+            except Exception as e:
+                logger.warning(f"Shared action counts query failed, counting per KPI: {str(e)}")
+
             # Get all KPIs
-            actions_created = self.get_number_of_actions_created(customer_id, start_date, end_date)
-            completion_on_time = self.get_percentage_of_actions_completed_on_time(customer_id, start_date, end_date)
-            open_vs_closed = self.get_open_vs_closed_actions(customer_id, start_date, end_date)
+            actions_created = self.get_number_of_actions_created(customer_id, start_date, end_date, counts=counts)
+            completion_on_time = self.get_percentage_of_actions_completed_on_time(customer_id, start_date, end_date,
+                                                                                  counts=counts)
+            open_vs_closed = self.get_open_vs_closed_actions(customer_id, start_date, end_date, counts=counts)
 
             # Get insights
             overdue_employees = self.get_employees_not_completing_on_time(customer_id, start_date, end_date)
@@ -687,13 +672,15 @@ class ActionTrackingKPIsExtractor:
 
 
 # Standalone function for testing and external usage
-def get_action_tracking_kpis(customer_id: Optional[str] = None, days_back: int = 365) -> Dict[str, Any]:
+def get_action_tracking_kpis(customer_id: Optional[str] = None, days_back: int = 365,
+                             db_session: Optional[Session] = None) -> Dict[str, Any]:
     """
     Standalone function to get Action Tracking KPIs
 
     Args:
         customer_id: Optional customer ID for filtering
         days_back: Number of days to look back from current date
+        db_session: Optional existing session to reuse; it is left open for the caller
 
     Returns:
         Dictionary containing all Action Tracking KPIs
@@ -710,7 +697,9 @@ def get_action_tracking_kpis(customer_id: Optional[str] = None, days_back: int =
         from config.database_config import db_manager
 
         # Get database session (using ProcessSafety database for action tracking)
-        db_session = db_manager.get_process_safety_session()
+        owns_session = db_session is None
+        if owns_session:
+            db_session = db_manager.get_process_safety_session()
         if not db_session:
             return {"error": "Failed to get database session"}
 
@@ -722,8 +711,9 @@ def get_action_tracking_kpis(customer_id: Optional[str] = None, days_back: int =
         extractor = ActionTrackingKPIsExtractor(db_session)
         kpis = extractor.get_all_action_tracking_kpis(customer_id, start_date, end_date)
 
-        # Close session
-        db_session.close()
+        # Close session if we opened it
+        if owns_session:
+            db_session.close()
 
         return kpis
 
@@ -29,6 +29,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Overdue filter shared by the schedules and histories queries; format with the table alias
+OVERDUE_PREDICATE = '{alias}."attribute"::jsonb->>\'additionalStatus\' = \'OVERDUE\''
+
 
 class DriverSafetyChecklistKPIsExtractor:
     """Extract driver safety checklist KPIs from ProcessSafety tables"""
@@ -514,12 +517,12 @@ class DriverSafetyChecklistKPIsExtractor:
                 ORDER BY ca."ChecklistAssignmentId", cq."text"
             """)
 
-            result = self.db_session.execute(query, params)
-            answers_data = result.fetchall()
+            # Iterate the result directly so rows are grouped without an intermediate fetchall() list
+            answers_result = self.db_session.execute(query, params)
 
             # Group answers by checklist assignment (vehicle inspection)
             vehicle_inspections = {}
-            for row in answers_data:
+            for row in answers_result:
                 assignment_id = row[0]
                 if assignment_id not in vehicle_inspections:
                     vehicle_inspections[assignment_id] = {
@@ -639,14 +642,11 @@ class DriverSafetyChecklistKPIsExtractor:
                 WHERE {where_clause}
                 AND ps."createdAt" >= :start_date
                 AND ps."createdAt" <= :end_date
-                AND ps."attribute" IS NOT NULL
-                AND ps."attribute"::text LIKE '%"additionalStatus"%'
-                AND ps."attribute"::text LIKE '%"OVERDUE"%'
+                AND {OVERDUE_PREDICATE.format(alias="ps")}
                 ORDER BY ps."createdAt" DESC
             """)
 
-            schedules_result = self.db_session.execute(schedules_query, params)
-            overdue_schedules = schedules_result.fetchall()
+            overdue_schedules = self.db_session.execute(schedules_query, params)
 
             # Query to get overdue histories
             histories_query = text(f"""
@@ -666,14 +666,11 @@ class DriverSafetyChecklistKPIsExtractor:
                 WHERE {where_clause}
                 AND ph."createdAt" >= :start_date
                 AND ph."createdAt" <= :end_date
-                AND ph."attribute" IS NOT NULL
-                AND ph."attribute"::text LIKE '%"additionalStatus"%'
-                AND ph."attribute"::text LIKE '%"OVERDUE"%'
+                AND {OVERDUE_PREDICATE.format(alias="ph")}
                 ORDER BY ph."createdAt" DESC
             """)
 
-            histories_result = self.db_session.execute(histories_query, params)
-            overdue_histories = histories_result.fetchall()
+            overdue_histories = self.db_session.execute(histories_query, params)
 
             # Process overdue schedules
             overdue_schedules_data = []
@@ -877,21 +874,23 @@ class DriverSafetyChecklistKPIsExtractor:
 
 # Utility function for easy usage
 def get_driver_safety_checklist_kpis(customer_id: Optional[str] = None,
-                                   days_back: int = 365) -> Dict[str, Any]:
+                                   days_back: int = 365,
+                                   db_session: Optional[Session] = None) -> Dict[str, Any]:
     """
     Utility function to extract all driver safety checklist KPIs
 
     Args:
         customer_id: Optional customer ID to filter data
         days_back: Number of days to look back if start_date not provided
+        db_session: Optional existing session to reuse instead of checking out a new one
 
     Returns:
         Dictionary containing all driver safety checklist KPIs
     """
     try:
         # Create extractor and get KPIs
-        extractor = DriverSafetyChecklistKPIsExtractor()
-        kpis = extractor.get_driver_safety_checklist_kpis(customer_id, days_back)
+        extractor = DriverSafetyChecklistKPIsExtractor(db_session)
+        kpis = extractor.get_driver_safety_checklist_kpis(customer_id, days_back=days_back)
 
         # Close the extractor
         extractor.close()
@@ -11,17 +11,17 @@ from typing import Dict, Any, List, Optional
 import os
 import re
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def convert_numpy_types(obj):
     """Convert numpy types to native Python types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
+    # Plain builtins are most leaves; np.float64 subclasses float, so check exact types
+    obj_type = type(obj)
+    if obj is None or obj_type is str or obj_type is int or obj_type is float or obj_type is bool:
+        return obj
+    if isinstance(obj, (np.integer, np.floating)):
+        return obj.item()
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, dict):
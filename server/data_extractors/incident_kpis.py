@@ -33,6 +33,23 @@ import json
 
 logger = logging.getLogger(__name__)
 
+_SQL_INCIDENT_SUBTAG_IDS = text("""
+    SELECT DISTINCT pst.id
+    FROM "ProcessSafetySubTags" pst
+    JOIN "ProcessSafetyTags" pt ON pst."tagId" = pt.id
+    WHERE (
+        LOWER(pt."tagName") LIKE '%incident%'
+        OR LOWER(pst."subTag") LIKE '%incident%'
+    )
+    AND (pst."isDeleted" = false OR pst."isDeleted" IS NULL)
+""")
+_SQL_SUBTAG_EXISTS = text("""
+    SELECT id
+    FROM "ProcessSafetySubTags"
+    WHERE id = :subtag_id
+    AND ("isDeleted" = false OR "isDeleted" IS NULL)
+""")
+
 
 class IncidentKPIsExtractor:
     """Extract incident investigation KPIs from ProcessSafety tables"""
@@ -68,12 +85,8 @@ class IncidentKPIsExtractor:
             from config.database_config import db_manager
             logger.info("Recreating database session due to connection issue")
 
-            # Clean up current session if it exists
-            if self.db_session:
-                db_manager.cleanup_session(self.db_session)
-
-            # Get fresh session
-            self.db_session = db_manager.create_fresh_session()
+            # Clean up the current session and get a fresh one
+            self.db_session = db_manager.refresh_session(self.db_session)
             logger.info("Database session recreated successfully")
             return True
         except Exception as e:
@@ -138,18 +151,7 @@ class IncidentKPIsExtractor:
 
         try:
             # Match your SQL query exactly - no customer filtering unless specifically needed
-            query = text("""
-                SELECT DISTINCT pst.id
-                FROM "ProcessSafetySubTags" pst
-                JOIN "ProcessSafetyTags" pt ON pst."tagId" = pt.id
-                WHERE (
-                    LOWER(pt."tagName") LIKE '%incident%'
-                    OR LOWER(pst."subTag") LIKE '%incident%'
-                )
-                AND (pst."isDeleted" = false OR pst."isDeleted" IS NULL)
-            """)
-
-            result = self._execute_query_safely(query)
+            result = self._execute_query_safely(_SQL_INCIDENT_SUBTAG_IDS)
             self._all_subtag_ids = [row[0] for row in result.fetchall()]
 
             logger.info(f"Found {len(self._all_subtag_ids)} incident-related subTagIds")
@@ -169,14 +171,7 @@ class IncidentKPIsExtractor:
             specific_subtag_id = "1c6d7b7a-8feb-487d-8640-03fcd6b0275f"
 
             # Verify this subTagId exists in the database
-            query = text("""
-                SELECT id
-                FROM "ProcessSafetySubTags"
-                WHERE id = :subtag_id
-                AND ("isDeleted" = false OR "isDeleted" IS NULL)
-            """)
-
-            result = self._execute_query_safely(query, {"subtag_id": specific_subtag_id})
+            result = self._execute_query_safely(_SQL_SUBTAG_EXISTS, {"subtag_id": specific_subtag_id})
             row = result.fetchone()
 
             if row:
@@ -607,15 +602,25 @@ class IncidentKPIsExtractor:
 
             where_clause = " AND ".join(conditions)
 
-            # Query to extract incResolvedTimeInMins from attribute JSON
+            # Average incResolvedTimeInMins in SQL so only one aggregate row is returned
             query = text(f"""
                 SELECT
-                    CAST(ph."attribute"->>'incResolvedTimeInMins' AS NUMERIC) as resolved_time_mins
-                FROM "ProcessSafetyHistories" ph
-                WHERE {where_clause}
-                AND ph."attribute"->>'incResolvedTimeInMins' IS NOT NULL
-                AND ph."attribute"->>'incResolvedTimeInMins' != ''
-                AND ph."attribute"->>'incResolvedTimeInMins' ~ '^[0-9]+\.?[0-9]*$'
+                    COUNT(*) as total_investigations,
+                    AVG(rt.resolved_time_mins) as average_time
+                FROM (
+                    SELECT
+                        -- Guard the cast inside CASE: the planner may evaluate the outer filter before the
+                        -- WHERE regex, and a bare CAST would fail the query on one non-numeric value
+                        CASE
+                            WHEN ph."attribute"->>'incResolvedTimeInMins' ~ '^[0-9]+\.?[0-9]*$'
+                            THEN CAST(ph."attribute"->>'incResolvedTimeInMins' AS NUMERIC)
+                        END as resolved_time_mins
+                    FROM "ProcessSafetyHistories" ph
+                    WHERE {where_clause}
+                    AND ph."attribute"->>'incResolvedTimeInMins' IS NOT NULL
+                    AND ph."attribute"->>'incResolvedTimeInMins' != ''
+                ) rt
+                WHERE rt.resolved_time_mins > 0  -- Only include valid positive times
             """)
 
             params = {
@@ -623,26 +628,11 @@ class IncidentKPIsExtractor:
                 "end_date": end_date
             }
             result = self.db_session.execute(query, params)
-            rows = result.fetchall()
-
-            if not rows:
-                return {
-                    "average_completion_time_mins": 0,
-                    "total_completed_investigations": 0,
-                    "date_range": {
-                        "start_date": start_date.isoformat(),
-                        "end_date": end_date.isoformat()
-                    }
-                }
+            row = result.fetchone()
 
-            # Extract completion times
-            completion_times = []
-            for row in rows:
-                resolved_time_mins = float(row[0]) if row[0] is not None else 0
-                if resolved_time_mins > 0:  # Only include valid positive times
-                    completion_times.append(resolved_time_mins)
+            total_investigations = row[0] if row and row[0] else 0
 
-            if not completion_times:
+            if not total_investigations:
                 return {
                     "average_completion_time_mins": 0,
                     "total_completed_investigations": 0,
@@ -652,9 +642,7 @@ class IncidentKPIsExtractor:
                     }
                 }
 
-            # Calculate simple statistics
-            total_investigations = len(completion_times)
-            average_time = sum(completion_times) / total_investigations
+            average_time = float(row[1])
 
             return {
                 "average_completion_time_mins": round(average_time, 2),
@@ -956,19 +944,6 @@ class IncidentKPIsExtractor:
             ]
             open_where = " AND ".join(open_conditions)
 
-            open_query = text(f"""
-                SELECT COUNT(*) as open_actions
-                FROM "ProcessSafetySchedules" ps
-                WHERE {open_where}
-            """)
-
-            # Count total actions (from schedules + histories) with date filtering
-            total_schedules_query = text(f"""
-                SELECT COUNT(*) as schedules_count
-                FROM "ProcessSafetySchedules" ps
-                WHERE {open_where}
-            """)
-
             subtag_condition_hist = self._format_sql_in_clause(action_subtag_ids, 'ph."subTagId"')
             histories_conditions = [
                 subtag_condition_hist,
@@ -977,10 +952,23 @@ class IncidentKPIsExtractor:
             ]
             histories_where = " AND ".join(histories_conditions)
 
-            total_histories_query = text(f"""
-                SELECT COUNT(*) as histories_count
-                FROM "ProcessSafetyHistories" ph
-                WHERE {histories_where}
+            # Open count, total and percentage in one statement; NULLIF guards the empty case
+            counts_query = text(f"""
+                SELECT
+                    oc.open_actions,
+                    oc.open_actions + hc.histories_count as total_actions,
+                    ROUND(oc.open_actions * 100.0 / NULLIF(oc.open_actions + hc.histories_count, 0), 2)
+                        as open_actions_percentage
+                FROM (
+                    SELECT COUNT(*) as open_actions
+                    FROM "ProcessSafetySchedules" ps
+                    WHERE {open_where}
+                ) oc
+                CROSS JOIN (
+                    SELECT COUNT(*) as histories_count
+                    FROM "ProcessSafetyHistories" ph
+                    WHERE {histories_where}
+                ) hc
             """)
 
             params = {
@@ -988,23 +976,12 @@ class IncidentKPIsExtractor:
                 "end_date": end_date
             }
 
-            # Execute queries
-            open_result = self.db_session.execute(open_query, params)
-            open_actions = open_result.fetchone()[0]
-
-            schedules_result = self.db_session.execute(total_schedules_query, params)
-            schedules_count = schedules_result.fetchone()[0]
-
-            histories_result = self.db_session.execute(total_histories_query, params)
-            histories_count = histories_result.fetchone()[0]
+            # Execute query
+            row = self.db_session.execute(counts_query, params).fetchone()
 
-            total_actions = schedules_count + histories_count
-
-            # Calculate percentage
-            if total_actions > 0:
-                open_percentage = (open_actions / total_actions) * 100
-            else:
-                open_percentage = 0.0
+            open_actions = row[0]
+            total_actions = row[1]
+            open_percentage = float(row[2] or 0)
 
             return {
                 "open_actions": open_actions,
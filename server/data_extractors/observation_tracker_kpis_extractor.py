@@ -21,8 +21,13 @@ Database Schema:
 - ChecklistAnswers: Contains user answers to checklist questions
 """
 
+import copy
+import heapq
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -30,6 +35,18 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Question filters for the checklist answers each KPI section is built from.
+# All sections share the same observation_forms CTE, so they are fetched together.
+FORM_ANSWER_SECTIONS = {
+    "area": 'LOWER(cq."text") = \'where?\'',
+    "priority": 'LOWER(cq."text") LIKE \'%severity%\'',
+    "remarks": 'LOWER(cq."text") LIKE \'%incident description%\'',
+}
+
+# Dashboards refresh the same (customer_id, days_back) window every few seconds
+KPI_CACHE_TTL_SECONDS = 60
+KPI_CACHE_MAX_SIZE = 256
+
 
 class ObservationTrackerKPIsExtractor:
     """Extract observation tracker KPIs from ProcessSafety tables"""
@@ -48,23 +65,49 @@ class ObservationTrackerKPIsExtractor:
         # Observation Tracker template ID as specified in requirements
         self.observation_tracker_template_id = '9bb83f61-b869-4721-81b6-0c870e91a779'
 
+        # Short-lived KPI results keyed by (customer_id, days_back)
+        self._kpi_cache: Dict[tuple, tuple] = {}
+        self._kpi_cache_lock = threading.Lock()
+
     def close(self):
         """Close database session if we created it"""
         if self._should_close_session and self.db_session:
             self.db_session.close()
 
+    def clear_cache(self):
+        """Drop cached KPI results so the next call reads fresh data"""
+        with self._kpi_cache_lock:
+            self._kpi_cache.clear()
+
+    def _get_cached_kpis(self, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached KPIs for cache_key if it has not expired"""
+        with self._kpi_cache_lock:
+            entry = self._kpi_cache.get(cache_key)
+            if entry is None:
+                return None
+            cached_at, kpis = entry
+            if time.monotonic() - cached_at > KPI_CACHE_TTL_SECONDS:
+                del self._kpi_cache[cache_key]
+                return None
+        logger.debug(f"Observation tracker KPI cache hit for {cache_key}")
+        return copy.deepcopy(kpis)
+
+    def _store_cached_kpis(self, cache_key: tuple, kpis: Dict[str, Any]):
+        """Cache a KPI result, evicting the oldest entry when full"""
+        with self._kpi_cache_lock:
+            if cache_key not in self._kpi_cache and len(self._kpi_cache) >= KPI_CACHE_MAX_SIZE:
+                oldest_key = min(self._kpi_cache, key=lambda k: self._kpi_cache[k][0])
+                del self._kpi_cache[oldest_key]
+            self._kpi_cache[cache_key] = (time.monotonic(), copy.deepcopy(kpis))
+
     def _recreate_session(self):
         """Recreate database session when connection is lost"""
         try:
             from config.database_config import db_manager
             logger.info("Recreating database session due to connection issue")
 
-            # Clean up current session if it exists
-            if self.db_session:
-                db_manager.cleanup_session(self.db_session)
-
-            # Get fresh session
-            self.db_session = db_manager.create_fresh_session()
+            # Clean up the current session and get a fresh one
+            self.db_session = db_manager.refresh_session(self.db_session)
             logger.info("Database session recreated successfully")
             return True
         except Exception as e:
@@ -118,6 +161,87 @@ class ObservationTrackerKPIsExtractor:
         # If we get here, all retries failed
         raise Exception(f"Query execution failed after {max_retries + 1} attempts")
 
+    def _fetch_form_answers(self, customer_id: Optional[str], start_date: datetime,
+                            end_date: datetime, sections: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Fetch grouped checklist answers for the requested sections in a single round-trip
+
+        Every section reuses the same observation_forms CTE; each one is a tagged branch
+        of a UNION ALL so the forms are resolved once per call instead of once per KPI.
+
+        Returns:
+            Dictionary mapping section name to rows of (answer, question_text, templateName, answer_count)
+        """
+        sections = list(sections or FORM_ANSWER_SECTIONS)
+
+        # Build where conditions with bound parameters so the SQL text stays constant per customer filter
+        conditions = ['ptc.id = :template_id']
+        params = {
+            "template_id": self.observation_tracker_template_id,
+            "start_date": start_date,
+            "end_date": end_date
+        }
+
+        if customer_id:
+            conditions.append('ptc."customerId" = :customer_id')
+            params["customer_id"] = customer_id
+
+        template_where = " AND ".join(conditions)
+
+        section_queries = [f"""
+                SELECT
+                    ca."answer",
+                    cq."text" as question_text,
+                    of."templateName",
+                    COUNT(*) as answer_count,
+                    '{section}' as section
+                FROM observation_forms of
+                JOIN "ChecklistQuestions" cq ON of.checklist_id = cq."checklistId"
+                JOIN "ChecklistAnswers" ca ON cq.id = ca."question"
+                WHERE {FORM_ANSWER_SECTIONS[section]}
+                AND ca."answer" IS NOT NULL
+                AND CAST(ca."answer" AS TEXT) != '[]'
+                AND CAST(ca."answer" AS TEXT) != ''
+                AND CAST(ca."answer" AS TEXT) != 'null'
+                AND LENGTH(CAST(ca."answer" AS TEXT)) > 2
+                GROUP BY ca."answer", cq."text", of."templateName"
+        """ for section in sections]
+
+        # Query to get answers for all requested questions from observation forms with date filtering
+        query = text(f"""
+            WITH observation_forms AS (
+                -- Get observation forms from schedules with date filtering
+                SELECT DISTINCT cl.id as checklist_id, ptc."templateName"
+                FROM "ProcessSafetyTemplatesCollections" ptc
+                JOIN "ProcessSafetySchedules" ps ON ptc.id = ps."templateId"
+                JOIN "CheckLists" cl ON ptc.id = cl."templateId"
+                WHERE {template_where}
+                AND ps."createdAt" >= :start_date
+                AND ps."createdAt" <= :end_date
+
+                UNION
+
+                -- Get observation forms from histories with date filtering
+                SELECT DISTINCT cl.id as checklist_id, ptc."templateName"
+                FROM "ProcessSafetyTemplatesCollections" ptc
+                JOIN "ProcessSafetyHistories" ph ON ptc.id = ph."templateId"
+                JOIN "CheckLists" cl ON ptc.id = cl."templateId"
+                WHERE {template_where}
+                AND ph."createdAt" >= :start_date
+                AND ph."createdAt" <= :end_date
+            )
+            {" UNION ALL ".join(section_queries)}
+            ORDER BY answer_count DESC
+        """)
+
+        result = self._execute_query_safely(query, params)
+
+        answers = {section: [] for section in sections}
+        for row in result.fetchall():
+            answers[row[4]].append(row)
+
+        return answers
+
     def get_observation_tracker_kpis(self, customer_id: Optional[str] = None,
                                    start_date: Optional[datetime] = None,
                                    end_date: Optional[datetime] = None,
@@ -133,8 +257,18 @@ class ObservationTrackerKPIsExtractor:
 
         Returns:
             Dictionary containing all observation tracker KPIs
+
+        Results for a days_back window (no explicit dates) are cached for KPI_CACHE_TTL_SECONDS.
         """
         try:
+            # Only relative windows repeat between dashboard refreshes, so only those are cached
+            cache_key = None
+            if start_date is None and end_date is None:
+                cache_key = (customer_id, days_back)
+                cached_kpis = self._get_cached_kpis(cache_key)
+                if cached_kpis is not None:
+                    return cached_kpis
+
             # Calculate date range - use provided dates or calculate from days_back
             if not end_date:
                 end_date = datetime.now()
@@ -143,13 +277,28 @@ class ObservationTrackerKPIsExtractor:
 
             logger.info(f"Extracting observation tracker KPIs for customer: {customer_id}")
 
+            # Fetch the answers behind area, priority and remarks in one round-trip; if that fails,
+            # each section falls back to its own query and error handling
+            try:
+                form_answers = self._fetch_form_answers(customer_id, start_date, end_date)
+            except Exception as e:
+                logger.warning(f"Combined form answers query failed, fetching per section: {str(e)}")
+                try:
+                    self.db_session.rollback()
+                except Exception as rollback_error:
+                    logger.debug(f"Rollback failed after combined query error: {str(rollback_error)}")
+                form_answers = None
+
             # Get all KPIs
-            observations_by_area = self.get_observations_by_area(customer_id, start_date, end_date)
+            observations_by_area = self.get_observations_by_area(customer_id, start_date, end_date,
+                                                                 rows=form_answers["area"] if form_answers else None)
             observation_status = self.get_observation_status(customer_id, start_date, end_date)
-            observation_priority = self.get_observation_priority(customer_id, start_date, end_date)
-            observations_remarks_insight = self.get_observations_based_on_remarks(customer_id, start_date, end_date)
+            observation_priority = self.get_observation_priority(customer_id, start_date, end_date,
+                                                                 rows=form_answers["priority"] if form_answers else None)
+            observations_remarks_insight = self.get_observations_based_on_remarks(customer_id, start_date, end_date,
+                                                                                  rows=form_answers["remarks"] if form_answers else None)
 
-            return {
+            kpis = {
                 "template_id": self.observation_tracker_template_id,
                 "template_name": "Observation Report",
                 "observations_by_area": observations_by_area,
@@ -172,6 +321,13 @@ class ObservationTrackerKPIsExtractor:
                 }
             }
 
+            # Don't cache partial results so a transient query failure isn't served for a minute
+            sections = (observations_by_area, observation_status, observation_priority, observations_remarks_insight)
+            if cache_key is not None and not any("error" in section for section in sections):
+                self._store_cached_kpis(cache_key, kpis)
+
+            return kpis
+
         except Exception as e:
             logger.error(f"Error getting observation tracker KPIs: {str(e)}")
             # Rollback any pending transaction, but don't fail if rollback fails
@@ -200,9 +356,11 @@ class ObservationTrackerKPIsExtractor:
 
     def get_observations_by_area(self, customer_id: Optional[str] = None,
                                start_date: Optional[datetime] = None,
-                               end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                               end_date: Optional[datetime] = None,
+                               rows: Optional[List[Any]] = None) -> Dict[str, Any]:
         """
         Get observations by area - same logic as incident KPI f, but question title will be "Where?"
+        Pass rows from _fetch_form_answers to skip the query
         """
         try:
             # Set default date range if not provided
@@ -211,61 +369,8 @@ class ObservationTrackerKPIsExtractor:
             if not start_date:
                 start_date = end_date - timedelta(days=365)  # Last year
 
-            # Build where conditions
-            conditions = [f'ptc.id = \'{self.observation_tracker_template_id}\'']
-            
-            if customer_id:
-                conditions.append(f'ptc."customerId" = \'{customer_id}\'')
-
-            template_where = " AND ".join(conditions)
-
-            # Query to get area information from observation forms with date filtering - specifically looking for "Where?" question
-            area_query = text(f"""
-                WITH observation_forms AS (
-                    -- Get observation forms from schedules with date filtering
-                    SELECT DISTINCT cl.id as checklist_id
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetySchedules" ps ON ptc.id = ps."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ps."createdAt" >= :start_date
-                    AND ps."createdAt" <= :end_date
-
-                    UNION
-
-                    -- Get observation forms from histories with date filtering
-                    SELECT DISTINCT cl.id as checklist_id
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetyHistories" ph ON ptc.id = ph."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ph."createdAt" >= :start_date
-                    AND ph."createdAt" <= :end_date
-                )
-                SELECT DISTINCT
-                    ca."answer",
-                    cq."text" as question_text,
-                    COUNT(*) as observation_count
-                FROM observation_forms of
-                JOIN "ChecklistQuestions" cq ON of.checklist_id = cq."checklistId"
-                JOIN "ChecklistAnswers" ca ON cq.id = ca."question"
-                WHERE LOWER(cq."text") = 'where?'
-                AND ca."answer" IS NOT NULL
-                AND CAST(ca."answer" AS TEXT) != '[]'
-                AND CAST(ca."answer" AS TEXT) != ''
-                AND CAST(ca."answer" AS TEXT) != 'null'
-                AND LENGTH(CAST(ca."answer" AS TEXT)) > 2
-                GROUP BY ca."answer", cq."text"
-                ORDER BY observation_count DESC
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            result = self._execute_query_safely(area_query, params)
-            rows = result.fetchall()
+            if rows is None:
+                rows = self._fetch_form_answers(customer_id, start_date, end_date, ["area"])["area"]
 
             observations_by_area = {}
             total_observations = 0
@@ -293,7 +398,7 @@ class ObservationTrackerKPIsExtractor:
                     # Clean up area name
                     area_name = area_name.strip().strip('"').strip("'")
                     if area_name and area_name.lower() not in ['null', 'none', '']:
-                        observation_count = int(row[2])
+                        observation_count = int(row[3])
                         observations_by_area[area_name] = observation_count
                         total_observations += observation_count
 
@@ -340,43 +445,38 @@ class ObservationTrackerKPIsExtractor:
             if not start_date:
                 start_date = end_date - timedelta(days=365)  # Last year
 
-            # Build where conditions
-            conditions = [f'"templateId" = \'{self.observation_tracker_template_id}\'']
+            # Build where conditions with bound parameters
+            conditions = ['"templateId" = :template_id']
+            params = {
+                "template_id": self.observation_tracker_template_id,
+                "start_date": start_date,
+                "end_date": end_date
+            }
 
             if customer_id:
-                conditions.append(f'"customerId" = \'{customer_id}\'')
+                conditions.append('"customerId" = :customer_id')
+                params["customer_id"] = customer_id
 
             where_clause = " AND ".join(conditions)
 
-            # Query to get open observations from schedules table
-            open_query = text(f"""
-                SELECT COUNT(*) as open_count
-                FROM "ProcessSafetySchedules"
-                WHERE {where_clause}
-                AND "createdAt" >= :start_date
-                AND "createdAt" <= :end_date
+            # Count open observations (schedules) and closed observations (histories) in one query
+            status_query = text(f"""
+                SELECT
+                    (SELECT COUNT(*)
+                     FROM "ProcessSafetySchedules"
+                     WHERE {where_clause}
+                     AND "createdAt" >= :start_date
+                     AND "createdAt" <= :end_date) as open_count,
+                    (SELECT COUNT(*)
+                     FROM "ProcessSafetyHistories"
+                     WHERE {where_clause}
+                     AND "createdAt" >= :start_date
+                     AND "createdAt" <= :end_date) as closed_count
             """)
 
-            # Query to get closed observations from histories table
-            closed_query = text(f"""
-                SELECT COUNT(*) as closed_count
-                FROM "ProcessSafetyHistories"
-                WHERE {where_clause}
-                AND "createdAt" >= :start_date
-                AND "createdAt" <= :end_date
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            # Execute queries
-            open_result = self._execute_query_safely(open_query, params)
-            open_count = open_result.scalar() or 0
-
-            closed_result = self._execute_query_safely(closed_query, params)
-            closed_count = closed_result.scalar() or 0
+            row = self._execute_query_safely(status_query, params).fetchone()
+            open_count = row[0] or 0
+            closed_count = row[1] or 0
 
             total_observations = open_count + closed_count
 
@@ -405,9 +505,11 @@ class ObservationTrackerKPIsExtractor:
 
     def get_observation_priority(self, customer_id: Optional[str] = None,
                                start_date: Optional[datetime] = None,
-                               end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                               end_date: Optional[datetime] = None,
+                               rows: Optional[List[Any]] = None) -> Dict[str, Any]:
         """
         Get observation priority - same logic as incident KPI f, but question title will be "Severity"
+        Pass rows from _fetch_form_answers to skip the query
         """
         try:
             # Set default date range if not provided
@@ -416,61 +518,8 @@ class ObservationTrackerKPIsExtractor:
             if not start_date:
                 start_date = end_date - timedelta(days=365)  # Last year
 
-            # Build where conditions
-            conditions = [f'ptc.id = \'{self.observation_tracker_template_id}\'']
-
-            if customer_id:
-                conditions.append(f'ptc."customerId" = \'{customer_id}\'')
-
-            template_where = " AND ".join(conditions)
-
-            # Query to get priority information from observation forms with date filtering - specifically looking for "Severity" question
-            priority_query = text(f"""
-                WITH observation_forms AS (
-                    -- Get observation forms from schedules with date filtering
-                    SELECT DISTINCT cl.id as checklist_id
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetySchedules" ps ON ptc.id = ps."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ps."createdAt" >= :start_date
-                    AND ps."createdAt" <= :end_date
-
-                    UNION
-
-                    -- Get observation forms from histories with date filtering
-                    SELECT DISTINCT cl.id as checklist_id
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetyHistories" ph ON ptc.id = ph."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ph."createdAt" >= :start_date
-                    AND ph."createdAt" <= :end_date
-                )
-                SELECT DISTINCT
-                    ca."answer",
-                    cq."text" as question_text,
-                    COUNT(*) as observation_count
-                FROM observation_forms of
-                JOIN "ChecklistQuestions" cq ON of.checklist_id = cq."checklistId"
-                JOIN "ChecklistAnswers" ca ON cq.id = ca."question"
-                WHERE LOWER(cq."text") LIKE '%severity%'
-                AND ca."answer" IS NOT NULL
-                AND CAST(ca."answer" AS TEXT) != '[]'
-                AND CAST(ca."answer" AS TEXT) != ''
-                AND CAST(ca."answer" AS TEXT) != 'null'
-                AND LENGTH(CAST(ca."answer" AS TEXT)) > 2
-                GROUP BY ca."answer", cq."text"
-                ORDER BY observation_count DESC
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            result = self._execute_query_safely(priority_query, params)
-            rows = result.fetchall()
+            if rows is None:
+                rows = self._fetch_form_answers(customer_id, start_date, end_date, ["priority"])["priority"]
 
             observations_by_priority = {}
             total_observations = 0
@@ -498,7 +547,7 @@ class ObservationTrackerKPIsExtractor:
                     # Clean up priority name
                     priority_name = priority_name.strip().strip('"').strip("'")
                     if priority_name and priority_name.lower() not in ['null', 'none', '']:
-                        observation_count = int(row[2])
+                        observation_count = int(row[3])
                         observations_by_priority[priority_name] = observation_count
                         total_observations += observation_count
 
@@ -527,10 +576,12 @@ class ObservationTrackerKPIsExtractor:
 
     def get_observations_based_on_remarks(self, customer_id: Optional[str] = None,
                                         start_date: Optional[datetime] = None,
-                                        end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                                        end_date: Optional[datetime] = None,
+                                        rows: Optional[List[Any]] = None) -> Dict[str, Any]:
         """
         Get observations based on remarks - same logic as incident KPI f, but question title will be "Incident Description"
         Collect all data answered by user and process with AI to get summary
+        Pass rows from _fetch_form_answers to skip the query
         """
         try:
             # Set default date range if not provided
@@ -539,62 +590,8 @@ class ObservationTrackerKPIsExtractor:
             if not start_date:
                 start_date = end_date - timedelta(days=365)  # Last year
 
-            # Build where conditions
-            conditions = [f'ptc.id = \'{self.observation_tracker_template_id}\'']
-
-            if customer_id:
-                conditions.append(f'ptc."customerId" = \'{customer_id}\'')
-
-            template_where = " AND ".join(conditions)
-
-            # Query to get observation descriptions from user answers with date filtering
-            query = text(f"""
-                WITH observation_forms AS (
-                    -- Get observation forms from schedules with date filtering
-                    SELECT DISTINCT cl.id as checklist_id, ptc."templateName"
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetySchedules" ps ON ptc.id = ps."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ps."createdAt" >= :start_date
-                    AND ps."createdAt" <= :end_date
-
-                    UNION
-
-                    -- Get observation forms from histories with date filtering
-                    SELECT DISTINCT cl.id as checklist_id, ptc."templateName"
-                    FROM "ProcessSafetyTemplatesCollections" ptc
-                    JOIN "ProcessSafetyHistories" ph ON ptc.id = ph."templateId"
-                    JOIN "CheckLists" cl ON ptc.id = cl."templateId"
-                    WHERE {template_where}
-                    AND ph."createdAt" >= :start_date
-                    AND ph."createdAt" <= :end_date
-                )
-                SELECT DISTINCT
-                    ca."answer",
-                    cq."text" as question_text,
-                    of."templateName",
-                    COUNT(*) as answer_count
-                FROM observation_forms of
-                JOIN "ChecklistQuestions" cq ON of.checklist_id = cq."checklistId"
-                JOIN "ChecklistAnswers" ca ON cq.id = ca."question"
-                WHERE LOWER(cq."text") LIKE '%incident description%'
-                AND ca."answer" IS NOT NULL
-                AND CAST(ca."answer" AS TEXT) != '[]'
-                AND CAST(ca."answer" AS TEXT) != ''
-                AND CAST(ca."answer" AS TEXT) != 'null'
-                AND LENGTH(CAST(ca."answer" AS TEXT)) > 2
-                GROUP BY ca."answer", cq."text", of."templateName"
-                ORDER BY answer_count DESC
-            """)
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date
-            }
-
-            result = self._execute_query_safely(query, params)
-            rows = result.fetchall()
+            if rows is None:
+                rows = self._fetch_form_answers(customer_id, start_date, end_date, ["remarks"])["remarks"]
 
             all_remarks = []
             total_remarks = 0
@@ -683,24 +680,24 @@ class ObservationTrackerKPIsExtractor:
 
             # Basic analysis without AI for now
             total_remarks = len(remarks_data)
-            total_count = sum(remark["count"] for remark in remarks_data)
+            total_count = sum(map(itemgetter("count"), remarks_data))
 
             # Get top 3 most frequent remarks
-            top_remarks = sorted(remarks_data, key=lambda x: x["count"], reverse=True)[:3]
+            top_remarks = heapq.nlargest(3, remarks_data, key=itemgetter("count"))
 
-            summary = f"Analysis of {total_remarks} unique observation remarks covering {total_count} total observations. "
+            parts = [f"Analysis of {total_remarks} unique observation remarks covering {total_count} total observations. "]
 
             if top_remarks:
-                summary += "Most frequently reported observations: "
-                for i, remark in enumerate(top_remarks, 1):
-                    summary += f"{i}. '{remark['remark']}' ({remark['count']} occurrences)"
-                    if i < len(top_remarks):
-                        summary += ", "
-                summary += ". "
+                parts.append("Most frequently reported observations: ")
+                parts.append(", ".join(
+                    f"{i}. '{remark['remark']}' ({remark['count']} occurrences)"
+                    for i, remark in enumerate(top_remarks, 1)
+                ))
+                parts.append(". ")
 
-            summary += "This data is ready for comprehensive AI analysis to identify patterns and safety insights."
+            parts.append("This data is ready for comprehensive AI analysis to identify patterns and safety insights.")
 
-            return summary
+            return "".join(parts)
 
         except Exception as e:
             logger.warning(f"Error generating AI summary: {str(e)}")
@@ -709,21 +706,23 @@ class ObservationTrackerKPIsExtractor:
 
 # Utility function for easy usage
 def get_observation_tracker_kpis(customer_id: Optional[str] = None,
-                               days_back: int = 365) -> Dict[str, Any]:
+                               days_back: int = 365,
+                               db_session: Optional[Session] = None) -> Dict[str, Any]:
     """
     Utility function to extract all observation tracker KPIs
 
     Args:
         customer_id: Optional customer ID to filter data
         days_back: Number of days to look back if start_date not provided
+        db_session: Optional existing session to reuse instead of checking out a new one
 
     Returns:
         Dictionary containing all observation tracker KPIs
     """
     try:
         # Create extractor and get KPIs
-        extractor = ObservationTrackerKPIsExtractor()
-        kpis = extractor.get_observation_tracker_kpis(customer_id, days_back)
+        extractor = ObservationTrackerKPIsExtractor(db_session)
+        kpis = extractor.get_observation_tracker_kpis(customer_id, days_back=days_back)
 
         # Close the extractor
         extractor.close()
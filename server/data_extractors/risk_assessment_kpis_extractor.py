@@ -18,25 +18,116 @@ Insights Implemented:
 9. Effectiveness of Measures
 """
 
+import copy
+import heapq
 import os
 import re
+import threading
+import time
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+from collections import Counter
+from functools import lru_cache, wraps
+from operator import itemgetter
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns used in per-row parsing loops, compiled once at import
+_RE_RISK = re.compile(r'(\d+)([A-E])')
+_RE_EFFECTS = re.compile(r'\(([PEAR])\)')
+_EFFECT_CODES = ('P', 'E', 'A', 'R')
+_RE_BULLET = re.compile(r'(?:•|\*|-|\d+\.)\s*([^•\*\-\d\n]+)')
+_RE_PAREN = re.compile(r'\([^)]*\)')
+_RE_RECOVERY = re.compile(r'Recovery Measures[:\s]*(.+?)(?=\n\n|\Z)', re.DOTALL | re.IGNORECASE)
+_RE_HAZARD_SPLIT = re.compile(r'[,;.\n]|<br>')
+
+# Hazard category -> keywords; one alternation matches every keyword in a single scan per hazard
+_HAZARD_CATEGORIES = {
+    "physical": ["falling", "slip", "trip", "pressure", "impact"],
+    "chemical": ["toxic", "chemical", "vapour", "fumes", "acid"],
+    "mechanical": ["equipment", "machinery", "vehicle", "tool"],
+    "environmental": ["weather", "temperature", "noise", "dust"]
+}
+_HAZARD_KEYWORD_CATEGORY = {keyword: category
+                            for category, keywords in _HAZARD_CATEGORIES.items()
+                            for keyword in keywords}
+_RE_HAZARD_KEYWORDS = re.compile('(?=(' + '|'.join(map(re.escape, _HAZARD_KEYWORD_CATEGORY)) + '))')
+
+# Likelihood letter -> numeric weight for risk scores
+_LIKELIHOOD_VALUES = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5}
+
+# Static part of get_number_of_assessments' details
+_ASSESSMENT_DETAILS_TEMPLATE = {"data_source": "risk_assessment_data.md"}
+
+# Shape returned by get_risk_assessment_kpis() when it fails; callers serialize it, never mutate it.
+# Read-only at the top level; nested values stay plain dicts/lists so json.dumps can serialize them
+_EMPTY_KPI_TEMPLATE: Mapping[str, Any] = MappingProxyType({
+    # Main KPIs (4 total)
+    "number_of_assessments": 0,
+    "severity_analysis": {"severity_distribution": {}, "average_severity": 0},
+    "likelihood_analysis": {"likelihood_distribution": {}, "most_common_likelihood": ""},
+    "hazard_effects": {"effects_distribution": {}, "total_effects": 0},
+
+    # Insights (5 total)
+    "common_control_measures": {"common_measures": [], "total_measures": 0},
+    "common_recovery_measures": {"recovery_measures": [], "total_measures": 0},
+    "high_residual_risk_activities": {"high_risk_activities": [], "total_high_risk": 0},
+    "common_hazards": {"common_hazards": [], "total_hazards": 0},
+    "measure_effectiveness": {"effectiveness_metrics": {}, "overall_effectiveness": 0},
+    "insights": ["Error generating KPIs - please check data availability"],
+
+    # Metadata
+    "data_source": "risk_assessment_data.md"
+})
+
+RISK_DATA_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'risk_assessment_data.md')
+
+# Parsed risk tables keyed by file path -> ((mtime_ns, size), DataFrame); the frames are treated as read-only
+_RISK_TABLE_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+# Parsed Initial/Residual rating columns keyed by file path -> (the cached frame they came from, columns)
+_PARSED_RISK_COLUMNS: Dict[str, Tuple[pd.DataFrame, Tuple[tuple, tuple]]] = {}
+
+# Full KPI results from get_risk_assessment_kpis(), keyed the same way; customer_id/days_back don't affect them
+_KPI_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+# (monotonic time, ISO string) of the last _now_iso() refresh, swapped as one tuple so readers never see half an update
+_now_iso_cache: Tuple[float, str] = (float('-inf'), "")
+
+
+def _now_iso() -> str:
+    """Current time as an ISO string, refreshed at most every half second (enough for last_updated fields)"""
+    global _now_iso_cache
+    cached_at, cached_iso = _now_iso_cache
+    now = time.monotonic()
+    if now - cached_at > 0.5:
+        cached_iso = datetime.now().isoformat()
+        _now_iso_cache = (now, cached_iso)
+    return cached_iso
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it can't be stat'ed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 
 def convert_numpy_types(obj):
     """Convert numpy types to native Python types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
+    # Plain builtins are most leaves; np.float64 subclasses float, so check exact types
+    obj_type = type(obj)
+    if obj is None or obj_type is str or obj_type is int or obj_type is float or obj_type is bool:
+        return obj
+    if isinstance(obj, (np.integer, np.floating)):
+        return obj.item()
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, dict):
@@ -46,103 +137,212 @@ def convert_numpy_types(obj):
     return obj
 
 
+@lru_cache(maxsize=64)
+def _compiled(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a dynamically built pattern once and reuse it on later calls"""
+    return re.compile(pattern, flags)
+
+
+def _count_keyword_hits(texts: List[str], keywords: List[str]) -> Dict[str, int]:
+    """Count how many texts mention each keyword (case-insensitive), scanning each text once"""
+    # The lookahead lets matches overlap, so every keyword occurrence is seen in a single pass
+    keyword_pattern = _compiled('(?=(' + '|'.join(re.escape(keyword.lower()) for keyword in keywords) + '))')
+
+    hits = Counter()
+    for text in texts:
+        hits.update(set(keyword_pattern.findall(text.lower())))
+
+    return {keyword: hits[keyword.lower()] for keyword in keywords if hits[keyword.lower()] > 0}
+
+
+def _cached_analysis(method):
+    """Memoize an analysis method's result until the risk data is reloaded"""
+    @wraps(method)
+    def wrapper(self):
+        cached = self._analysis_cache.get(method.__name__)
+        if cached is not None:
+            return cached
+
+        result = method(self)
+        # Don't keep error results so a later call can retry
+        if "error" not in result:
+            self._analysis_cache[method.__name__] = result
+        return result
+
+    return wrapper
+
+
 class RiskAssessmentKPIsExtractor:
     """Extract risk assessment KPIs from risk_assessment_data.md file"""
 
     def __init__(self):
         """Initialize the extractor"""
-        self.data_file_path = os.path.join(os.path.dirname(__file__), '..', 'risk_assessment_data.md')
+        self.data_file_path = RISK_DATA_FILE_PATH
         self.risk_data = None
         self._load_risk_data()
 
     def _load_risk_data(self):
         """Load and parse risk assessment data from markdown file"""
+        self._analysis_cache = {}
+        self.risk_data = self._get_risk_table()
+        self._n = len(self.risk_data)
+        self._loaded_at = datetime.now().isoformat()
+        self._parse_risk_columns()
+
+    def _get_risk_table(self) -> pd.DataFrame:
+        """Return the parsed risk table, reusing the previous parse while the file's mtime and size are unchanged"""
+        file_key = _file_signature(self.data_file_path)
+        if file_key is None:
+            # Let the reader log the missing file and return an empty table
+            return self._read_risk_table()
+
+        cache_key = os.path.abspath(self.data_file_path)
+
+        cached = _RISK_TABLE_CACHE.get(cache_key)
+        if cached is not None and cached[0] == file_key:
+            logger.debug("Using cached risk assessment table for %s", cache_key)
+            return cached[1]
+
+        risk_data = self._read_risk_table()
+        if not risk_data.empty:
+            _RISK_TABLE_CACHE[cache_key] = (file_key, risk_data)
+        return risk_data
+
+    @staticmethod
+    def _clean_header(header: str) -> str:
+        """Map a markdown table header to its column name"""
+        if 'No.' in header:
+            return 'No'
+        elif 'Situation' in header:
+            return 'Situation_Task'
+        elif 'Hazard' in header:
+            return 'Hazard_Threat'
+        elif 'Effect' in header:
+            return 'Effect_of_Hazard'
+        elif 'Groups' in header:
+            return 'Groups_Affected_Consequence'
+        elif 'Initial Risk' in header:
+            return 'Initial_Risk'
+        elif 'Control measures' in header:
+            return 'Control_Measures'
+        elif 'Residual' in header:
+            return 'Residual_Risk'
+        return header.replace(' ', '_').replace('/', '_')
+
+    def _read_risk_table(self) -> pd.DataFrame:
+        """Read the risk assessment table from the markdown file into a DataFrame"""
         try:
             if not os.path.exists(self.data_file_path):
-                logger.error(f"Risk assessment data file not found: {self.data_file_path}")
-                self.risk_data = pd.DataFrame()
-                return
-
-            # Read the markdown file
-            with open(self.data_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-            # Extract table data from markdown
-            lines = content.split('\n')
-            
-            # Find the header line (contains No., Situation/Task, etc.)
-            header_line = None
-            data_start_line = None
-            
-            for i, line in enumerate(lines):
-                if '**No.**' in line and '**Situation' in line:
-                    header_line = i
-                    # Skip the separator line (---)
-                    data_start_line = i + 2
-                    break
-
-            if header_line is None:
-                logger.error("Could not find table header in risk assessment data file")
-                self.risk_data = pd.DataFrame()
-                return
-
-            # Extract headers
-            header_line_content = lines[header_line]
-            headers = [h.strip().replace('**', '') for h in header_line_content.split('|')[1:-1]]
-            
-            # Clean up headers
-            clean_headers = []
-            for header in headers:
-                if 'No.' in header:
-                    clean_headers.append('No')
-                elif 'Situation' in header:
-                    clean_headers.append('Situation_Task')
-                elif 'Hazard' in header:
-                    clean_headers.append('Hazard_Threat')
-                elif 'Effect' in header:
-                    clean_headers.append('Effect_of_Hazard')
-                elif 'Groups' in header:
-                    clean_headers.append('Groups_Affected_Consequence')
-                elif 'Initial Risk' in header:
-                    clean_headers.append('Initial_Risk')
-                elif 'Control measures' in header:
-                    clean_headers.append('Control_Measures')
-                elif 'Residual' in header:
-                    clean_headers.append('Residual_Risk')
-                else:
-                    clean_headers.append(header.replace(' ', '_').replace('/', '_'))
-
-            # Extract data rows
-            data_rows = []
-            for i in range(data_start_line, len(lines)):
-                line = lines[i].strip()
-                if not line or line.startswith('#'):
-                    break
-                if '|' in line:
-                    row_data = [cell.strip() for cell in line.split('|')[1:-1]]
-                    if len(row_data) == len(clean_headers):
-                        data_rows.append(row_data)
+                logger.error("Risk assessment data file not found: %s", self.data_file_path)
+                return pd.DataFrame()
+
+            # Stream the markdown file line by line: scan to the header, then keep reading rows from the same iterator
+            with open(self.data_file_path, 'r', encoding='utf-8', buffering=1 << 16) as file:
+                # Find the header line (contains No., Situation/Task, etc.)
+                header_line_content = next(
+                    (line for line in file if '**No.**' in line and '**Situation' in line), None
+                )
+
+                if header_line_content is None:
+                    logger.error("Could not find table header in risk assessment data file")
+                    return pd.DataFrame()
+
+                # Extract headers
+                headers = [h.strip().replace('**', '') for h in header_line_content.split('|')[1:-1]]
+                clean_headers = [self._clean_header(header) for header in headers]
+
+                # Skip the separator line (---)
+                next(file, None)
+
+                # Extract data rows straight into per-column lists (positional, since header names can repeat)
+                data_columns = [[] for _ in clean_headers]
+                for line in file:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        break
+                    if '|' in line:
+                        row_data = [cell.strip() for cell in line.split('|')[1:-1]]
+                        if len(row_data) == len(clean_headers):
+                            for column_values, value in zip(data_columns, row_data):
+                                column_values.append(value)
 
             # Create DataFrame
-            if data_rows:
-                self.risk_data = pd.DataFrame(data_rows, columns=clean_headers)
-                logger.info(f"Loaded {len(self.risk_data)} risk assessment records")
-            else:
-                logger.warning("No data rows found in risk assessment file")
-                self.risk_data = pd.DataFrame()
+            if data_columns and data_columns[0]:
+                risk_data = pd.DataFrame(dict(enumerate(data_columns)))
+                risk_data.columns = clean_headers
+                logger.info("Loaded %d risk assessment records", len(risk_data))
+                return risk_data
+
+            logger.warning("No data rows found in risk assessment file")
+            return pd.DataFrame()
 
         except Exception as e:
-            logger.error(f"Error loading risk assessment data: {str(e)}")
-            self.risk_data = pd.DataFrame()
+            logger.error("Error loading risk assessment data: %s", e)
+            return pd.DataFrame()
+
+    def _parse_risk_column(self, column: str) -> Tuple[pd.Series, pd.Series, pd.Series, np.ndarray]:
+        """Vectorized _parse_risk_rating over a whole column: severity, likelihood, effects and
+        per-row (P, E, A, R) effect counts as an (n, 4) uint8 array"""
+        if column in self.risk_data.columns:
+            ratings = self.risk_data[column].fillna('').astype(str)
+        else:
+            ratings = pd.Series([''] * len(self.risk_data), index=self.risk_data.index, dtype=object)
+
+        rating_parts = ratings.str.extract(_RE_RISK)
+        severity = pd.to_numeric(rating_parts[0], errors='coerce').fillna(0).astype(int)
+        likelihood = rating_parts[1].fillna('').astype(object)
+        effects = ratings.str.findall(_RE_EFFECTS)
+        effect_counts = np.zeros((len(ratings), len(_EFFECT_CODES)), dtype=np.uint8)
+        for position, code in enumerate(_EFFECT_CODES):
+            effect_counts[:, position] = ratings.str.count(rf'\({code}\)').to_numpy(dtype=np.uint8)
+
+        return severity, likelihood, effects, effect_counts
+
+    def _parse_risk_columns(self):
+        """Parse Initial/Residual risk ratings once so KPI methods don't re-run regexes per row"""
+        # Extractors sharing the same cached table also share its parsed columns (read-only)
+        cache_key = os.path.abspath(self.data_file_path)
+        cached = _PARSED_RISK_COLUMNS.get(cache_key)
+        if cached is not None and cached[0] is self.risk_data:
+            initial_columns, residual_columns = cached[1]
+        else:
+            initial_columns = self._parse_risk_column('Initial_Risk')
+            residual_columns = self._parse_risk_column('Residual_Risk')
+            if not self.risk_data.empty:
+                _PARSED_RISK_COLUMNS[cache_key] = (self.risk_data, (initial_columns, residual_columns))
+
+        (self._initial_sev, self._initial_like,
+         self._initial_effects, self._initial_effect_counts) = initial_columns
+        (self._residual_sev, self._residual_like,
+         self._residual_effects, self._residual_effect_counts) = residual_columns
+
+    @staticmethod
+    def _likelihood_values(likelihoods: pd.Series) -> np.ndarray:
+        """Map likelihood letters A-E to 1-5 (3 when missing or unrecognised)"""
+        return likelihoods.map(_LIKELIHOOD_VALUES).fillna(3).to_numpy(dtype=np.int64)
+
+    def _column(self, column: str) -> List[Any]:
+        """Get a column's values as a plain list ('' for every row if the column is missing)"""
+        if column not in self.risk_data.columns:
+            return [''] * len(self.risk_data)
+
+        values = self.risk_data[column]
+        # Duplicate header names select a DataFrame; keep the first one
+        if isinstance(values, pd.DataFrame):
+            values = values.iloc[:, 0]
+        return values.tolist()
 
     def _parse_risk_rating(self, risk_string: str) -> Tuple[int, str, List[str]]:
         """Parse risk rating string like '2B (P) (A)' into severity, likelihood, and effects"""
         try:
             if pd.isna(risk_string) or not risk_string:
                 return 0, '', []
-            
+
+            if not isinstance(risk_string, str):
+                risk_string = str(risk_string)
+
             # Extract severity (number) and likelihood (letter)
-            risk_match = re.search(r'(\d+)([A-E])', str(risk_string))
+            risk_match = _RE_RISK.search(risk_string)
             if risk_match:
                 severity = int(risk_match.group(1))
                 likelihood = risk_match.group(2)
@@ -151,112 +351,94 @@ class RiskAssessmentKPIsExtractor:
                 likelihood = ''
             
             # Extract effects (letters in parentheses)
-            effects = re.findall(r'\(([PEAR])\)', str(risk_string))
+            effects = _RE_EFFECTS.findall(risk_string)
             
             return severity, likelihood, effects
             
         except Exception as e:
-            logger.warning(f"Error parsing risk rating '{risk_string}': {str(e)}")
+            logger.warning("Error parsing risk rating '%s': %s", risk_string, e)
             return 0, '', []
 
     def get_number_of_assessments(self) -> Dict[str, Any]:
         """Get total number of risk assessments conducted"""
         try:
-            total_assessments = len(self.risk_data)
+            total_assessments = self._n
             
             return {
                 "total_assessments": total_assessments,
-                "assessment_details": {
-                    "data_source": "risk_assessment_data.md",
-                    "last_updated": datetime.now().isoformat()
-                }
+                "assessment_details": {**_ASSESSMENT_DETAILS_TEMPLATE, "last_updated": self._loaded_at}
             }
             
         except Exception as e:
-            logger.error(f"Error getting number of assessments: {str(e)}")
+            logger.error("Error getting number of assessments: %s", e)
             return {
                 "total_assessments": 0,
                 "assessment_details": {},
                 "error": str(e)
             }
 
+    @_cached_analysis
     def get_severity_analysis(self) -> Dict[str, Any]:
         """Analyze severity of risks (1-5 scale)"""
         try:
             if self.risk_data.empty:
                 return {"severity_distribution": {}, "average_severity": 0}
             
-            initial_severities = []
-            residual_severities = []
-            
-            for _, row in self.risk_data.iterrows():
-                # Parse initial risk
-                initial_severity, _, _ = self._parse_risk_rating(row.get('Initial_Risk', ''))
-                if initial_severity > 0:
-                    initial_severities.append(initial_severity)
-                
-                # Parse residual risk
-                residual_severity, _, _ = self._parse_risk_rating(row.get('Residual_Risk', ''))
-                if residual_severity > 0:
-                    residual_severities.append(residual_severity)
-            
-            # Calculate distributions
-            initial_dist = {}
-            residual_dist = {}
-            
-            for i in range(1, 6):
-                initial_dist[str(i)] = initial_severities.count(i)
-                residual_dist[str(i)] = residual_severities.count(i)
-            
+            initial_severities = self._initial_sev[self._initial_sev > 0]
+            residual_severities = self._residual_sev[self._residual_sev > 0]
+
+            # Calculate distributions in one counting pass per column
+            severity_levels = range(1, 6)
+            initial_counts = np.bincount(initial_severities.to_numpy(), minlength=6)
+            residual_counts = np.bincount(residual_severities.to_numpy(), minlength=6)
+
+            initial_dist = {str(i): int(initial_counts[i]) for i in severity_levels}
+            residual_dist = {str(i): int(residual_counts[i]) for i in severity_levels}
+
+            initial_severities = initial_severities.tolist()
+            residual_severities = residual_severities.tolist()
+
             return {
                 "initial_severity": {
                     "distribution": initial_dist,
-                    "average": np.mean(initial_severities) if initial_severities else 0,
+                    "average": float(np.mean(initial_severities)) if initial_severities else 0,
                     "max": max(initial_severities) if initial_severities else 0,
                     "min": min(initial_severities) if initial_severities else 0
                 },
                 "residual_severity": {
                     "distribution": residual_dist,
-                    "average": np.mean(residual_severities) if residual_severities else 0,
+                    "average": float(np.mean(residual_severities)) if residual_severities else 0,
                     "max": max(residual_severities) if residual_severities else 0,
                     "min": min(residual_severities) if residual_severities else 0
                 },
                 "severity_reduction": {
-                    "average_reduction": (np.mean(initial_severities) - np.mean(residual_severities)) if initial_severities and residual_severities else 0
+                    "average_reduction": float(np.mean(initial_severities) - np.mean(residual_severities)) if initial_severities and residual_severities else 0
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing severity: {str(e)}")
+            logger.error("Error analyzing severity: %s", e)
             return {"severity_distribution": {}, "average_severity": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_likelihood_analysis(self) -> Dict[str, Any]:
         """Analyze likelihood of risks (A-E scale)"""
         try:
             if self.risk_data.empty:
                 return {"likelihood_distribution": {}, "most_common_likelihood": ""}
 
-            initial_likelihoods = []
-            residual_likelihoods = []
+            initial_likelihoods = self._initial_like[self._initial_like != '']
+            residual_likelihoods = self._residual_like[self._residual_like != '']
 
-            for _, row in self.risk_data.iterrows():
-                # Parse initial risk
-                _, initial_likelihood, _ = self._parse_risk_rating(row.get('Initial_Risk', ''))
-                if initial_likelihood:
-                    initial_likelihoods.append(initial_likelihood)
+            initial_likelihoods = initial_likelihoods.tolist()
+            residual_likelihoods = residual_likelihoods.tolist()
 
-                # Parse residual risk
-                _, residual_likelihood, _ = self._parse_risk_rating(row.get('Residual_Risk', ''))
-                if residual_likelihood:
-                    residual_likelihoods.append(residual_likelihood)
+            # Calculate distributions in one counting pass per column
+            initial_counts = Counter(initial_likelihoods)
+            residual_counts = Counter(residual_likelihoods)
 
-            # Calculate distributions
-            initial_dist = {}
-            residual_dist = {}
-
-            for letter in ['A', 'B', 'C', 'D', 'E']:
-                initial_dist[letter] = initial_likelihoods.count(letter)
-                residual_dist[letter] = residual_likelihoods.count(letter)
+            initial_dist = {letter: initial_counts[letter] for letter in ['A', 'B', 'C', 'D', 'E']}
+            residual_dist = {letter: residual_counts[letter] for letter in ['A', 'B', 'C', 'D', 'E']}
 
             # Find most common
             most_common_initial = max(initial_dist, key=initial_dist.get) if initial_likelihoods else ""
@@ -276,34 +458,35 @@ class RiskAssessmentKPIsExtractor:
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing likelihood: {str(e)}")
+            logger.error("Error analyzing likelihood: %s", e)
             return {"likelihood_distribution": {}, "most_common_likelihood": "", "error": str(e)}
 
+    @_cached_analysis
     def get_hazard_effects_analysis(self) -> Dict[str, Any]:
         """Analyze hazard effects (P,E,A,R)"""
         try:
             if self.risk_data.empty:
                 return {"effects_distribution": {}, "total_effects": 0}
 
-            all_effects = []
-            effects_by_assessment = []
-
-            for _, row in self.risk_data.iterrows():
-                # Parse initial risk effects
-                _, _, initial_effects = self._parse_risk_rating(row.get('Initial_Risk', ''))
-                # Parse residual risk effects
-                _, _, residual_effects = self._parse_risk_rating(row.get('Residual_Risk', ''))
-
-                # Combine effects (use initial if available, otherwise residual)
-                assessment_effects = initial_effects if initial_effects else residual_effects
-
-                if assessment_effects:
-                    effects_by_assessment.append({
-                        "assessment_no": row.get('No', ''),
-                        "situation": row.get('Situation_Task', ''),
-                        "effects": assessment_effects
-                    })
-                    all_effects.extend(assessment_effects)
+            # Combine effects (use initial if available, otherwise residual)
+            has_initial = self._initial_effect_counts.any(axis=1)
+            assessment_effect_counts = np.where(has_initial[:, None],
+                                                self._initial_effect_counts, self._residual_effect_counts)
+            effect_totals = assessment_effect_counts.sum(axis=0, dtype=np.int64).tolist()
+            total_effects = sum(effect_totals)
+
+            assessment_nos = self._column('No')
+            situations = self._column('Situation_Task')
+            initial_effects = self._initial_effects.tolist()
+            residual_effects = self._residual_effects.tolist()
+            effects_by_assessment = [
+                {
+                    "assessment_no": assessment_nos[i],
+                    "situation": situations[i],
+                    "effects": initial_effects[i] if has_initial[i] else residual_effects[i]
+                }
+                for i in np.nonzero(assessment_effect_counts.any(axis=1))[0].tolist()
+            ]
 
             # Calculate distribution
             effects_dist = {}
@@ -314,25 +497,25 @@ class RiskAssessmentKPIsExtractor:
                 'R': 'Reputation'
             }
 
-            for effect in ['P', 'E', 'A', 'R']:
-                count = all_effects.count(effect)
+            for effect, count in zip(_EFFECT_CODES, effect_totals):
                 effects_dist[effect] = {
                     "count": count,
-                    "percentage": (count / len(all_effects) * 100) if all_effects else 0,
+                    "percentage": (count / total_effects * 100) if total_effects else 0,
                     "meaning": effect_meanings[effect]
                 }
 
             return {
                 "effects_distribution": effects_dist,
-                "total_effects": len(all_effects),
+                "total_effects": total_effects,
                 "assessments_with_effects": len(effects_by_assessment),
                 "effects_by_assessment": effects_by_assessment
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing hazard effects: {str(e)}")
+            logger.error("Error analyzing hazard effects: %s", e)
             return {"effects_distribution": {}, "total_effects": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_common_control_measures(self) -> Dict[str, Any]:
         """Analyze common control measures"""
         try:
@@ -341,39 +524,27 @@ class RiskAssessmentKPIsExtractor:
 
             all_control_measures = []
 
-            for _, row in self.risk_data.iterrows():
-                control_text = row.get('Control_Measures', '')
+            for control_text in self._column('Control_Measures'):
                 if pd.notna(control_text) and control_text:
                     # Extract control measures (lines starting with bullet points or numbers)
-                    measures = re.findall(r'(?:•|\*|-|\d+\.)\s*([^•\*\-\d\n]+)', str(control_text))
+                    measures = _RE_BULLET.findall(str(control_text))
                     for measure in measures:
                         clean_measure = measure.strip()
                         if len(clean_measure) > 10:  # Filter out very short measures
                             all_control_measures.append(clean_measure)
 
             # Find common patterns in control measures
-            measure_keywords = {}
             common_patterns = [
                 'PPE', 'training', 'permit', 'first aid', 'competent', 'certified',
                 'inspection', 'barricade', 'ventilation', 'monitoring', 'safety'
             ]
+            measure_keywords = _count_keyword_hits(all_control_measures, common_patterns)
 
-            for keyword in common_patterns:
-                count = sum(1 for measure in all_control_measures if keyword.lower() in measure.lower())
-                if count > 0:
-                    measure_keywords[keyword] = count
-
-            # Get top 10 most common measures
-            top_measures = []
-            measure_counts = {}
-
-            for measure in all_control_measures:
-                # Simplify measure for counting
-                simple_measure = re.sub(r'\([^)]*\)', '', measure).strip()[:50]
-                measure_counts[simple_measure] = measure_counts.get(simple_measure, 0) + 1
+            # Get top 10 most common measures (simplified for counting)
+            measure_counts = Counter(_RE_PAREN.sub('', measure).strip()[:50] for measure in all_control_measures)
 
-            sorted_measures = sorted(measure_counts.items(), key=lambda x: x[1], reverse=True)
-            top_measures = [{"measure": measure, "count": count} for measure, count in sorted_measures[:10]]
+            top_counts = heapq.nlargest(10, measure_counts.items(), key=itemgetter(1))
+            top_measures = [{"measure": measure, "count": count} for measure, count in top_counts]
 
             return {
                 "common_measures": top_measures,
@@ -383,9 +554,10 @@ class RiskAssessmentKPIsExtractor:
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing control measures: {str(e)}")
+            logger.error("Error analyzing control measures: %s", e)
             return {"common_measures": [], "total_measures": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_common_recovery_measures(self) -> Dict[str, Any]:
         """Analyze common recovery measures"""
         try:
@@ -394,38 +566,29 @@ class RiskAssessmentKPIsExtractor:
 
             all_recovery_measures = []
 
-            for _, row in self.risk_data.iterrows():
-                control_text = row.get('Control_Measures', '')
+            for control_text in self._column('Control_Measures'):
                 if pd.notna(control_text) and control_text:
                     # Look for recovery measures section
-                    recovery_section = re.search(r'Recovery Measures[:\s]*(.+?)(?=\n\n|\Z)', str(control_text), re.DOTALL | re.IGNORECASE)
+                    recovery_section = _RE_RECOVERY.search(str(control_text))
                     if recovery_section:
                         recovery_text = recovery_section.group(1)
                         # Extract individual measures
-                        measures = re.findall(r'(?:•|\*|-|\d+\.)\s*([^•\*\-\d\n]+)', recovery_text)
+                        measures = _RE_BULLET.findall(recovery_text)
                         for measure in measures:
                             clean_measure = measure.strip()
                             if len(clean_measure) > 10:
                                 all_recovery_measures.append(clean_measure)
 
             # Count occurrences of recovery measures
-            measure_counts = {}
-            for measure in all_recovery_measures:
-                simple_measure = re.sub(r'\([^)]*\)', '', measure).strip()[:50]
-                measure_counts[simple_measure] = measure_counts.get(simple_measure, 0) + 1
+            measure_counts = Counter(_RE_PAREN.sub('', measure).strip()[:50] for measure in all_recovery_measures)
 
             # Get top recovery measures
-            sorted_measures = sorted(measure_counts.items(), key=lambda x: x[1], reverse=True)
-            top_measures = [{"measure": measure, "count": count} for measure, count in sorted_measures[:10]]
+            top_counts = heapq.nlargest(10, measure_counts.items(), key=itemgetter(1))
+            top_measures = [{"measure": measure, "count": count} for measure, count in top_counts]
 
             # Common recovery keywords
-            recovery_keywords = {}
             common_patterns = ['first aid', 'emergency', 'evacuation', 'medical', 'rescue', 'response']
-
-            for keyword in common_patterns:
-                count = sum(1 for measure in all_recovery_measures if keyword.lower() in measure.lower())
-                if count > 0:
-                    recovery_keywords[keyword] = count
+            recovery_keywords = _count_keyword_hits(all_recovery_measures, common_patterns)
 
             return {
                 "recovery_measures": top_measures,
@@ -435,105 +598,82 @@ class RiskAssessmentKPIsExtractor:
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing recovery measures: {str(e)}")
+            logger.error("Error analyzing recovery measures: %s", e)
             return {"recovery_measures": [], "total_measures": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_activities_with_high_residual_risk(self) -> Dict[str, Any]:
         """Get activities with residual risk above 1B"""
         try:
             if self.risk_data.empty:
                 return {"high_risk_activities": [], "total_high_risk": 0}
 
-            high_risk_activities = []
-
-            for _, row in self.risk_data.iterrows():
-                residual_severity, residual_likelihood, _ = self._parse_risk_rating(row.get('Residual_Risk', ''))
-
-                # Check if residual risk is above 1B
-                # Risk levels: 1A < 1B < 1C < 1D < 1E < 2A < 2B, etc.
-                is_high_risk = False
-
-                if residual_severity > 1:
-                    is_high_risk = True
-                elif residual_severity == 1 and residual_likelihood in ['C', 'D', 'E']:
-                    is_high_risk = True
-
-                if is_high_risk:
-                    # Get hazard text and handle Series
-                    hazard_text = row.get('Hazard_Threat', '')
-                    if hasattr(hazard_text, 'iloc'):
-                        hazard_text = hazard_text.iloc[0] if len(hazard_text) > 0 else ''
-
-                    high_risk_activities.append({
-                        "assessment_no": row.get('No', ''),
-                        "situation": row.get('Situation_Task', ''),
-                        "residual_risk": row.get('Residual_Risk', ''),
-                        "severity": residual_severity,
-                        "likelihood": residual_likelihood,
-                        "hazard": str(hazard_text)
-                    })
+            # Residual risk above 1B: any severity > 1, or severity 1 with likelihood C-E
+            residual_severities = self._residual_sev.to_numpy()
+            residual_likelihoods = self._residual_like.to_numpy()
+            high_risk_mask = (residual_severities > 1) | (
+                (residual_severities == 1) & np.isin(residual_likelihoods, ['C', 'D', 'E'])
+            )
+
+            assessment_nos = self._column('No')
+            situations = self._column('Situation_Task')
+            residual_risks = self._column('Residual_Risk')
+            hazards = self._column('Hazard_Threat')
+
+            high_risk_activities = [
+                {
+                    "assessment_no": assessment_nos[i],
+                    "situation": situations[i],
+                    "residual_risk": residual_risks[i],
+                    "severity": int(residual_severities[i]),
+                    "likelihood": residual_likelihoods[i],
+                    "hazard": str(hazards[i])
+                }
+                for i in np.nonzero(high_risk_mask)[0].tolist()
+            ]
 
             return {
                 "high_risk_activities": high_risk_activities,
                 "total_high_risk": len(high_risk_activities),
-                "percentage_high_risk": (len(high_risk_activities) / len(self.risk_data) * 100) if len(self.risk_data) > 0 else 0
+                "percentage_high_risk": (len(high_risk_activities) / self._n * 100) if self._n > 0 else 0
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing high residual risk activities: {str(e)}")
+            logger.error("Error analyzing high residual risk activities: %s", e)
             return {"high_risk_activities": [], "total_high_risk": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_common_hazards(self) -> Dict[str, Any]:
         """Analyze common hazards found"""
         try:
             if self.risk_data.empty:
                 return {"common_hazards": [], "total_hazards": 0}
 
+            # Lowercased once here; counting and categorization both work on these
             all_hazards = []
 
-            for _, row in self.risk_data.iterrows():
-                # Get hazard text - handle both single values and Series
-                hazard_text = row.get('Hazard_Threat', '')
-
-                # Convert pandas Series to string if needed
-                if hasattr(hazard_text, 'iloc'):
-                    # It's a Series, get the first value
-                    hazard_text = hazard_text.iloc[0] if len(hazard_text) > 0 else ''
-
-                if pd.notna(hazard_text) and str(hazard_text).strip():
-                    # Convert to string and split hazards by common separators
-                    hazard_str = str(hazard_text)
-                    hazards = re.split(r'[,;.\n]|<br>', hazard_str)
-                    for hazard in hazards:
-                        clean_hazard = hazard.strip()
-                        if len(clean_hazard) > 5:
-                            all_hazards.append(clean_hazard)
+            for hazard_text in self._column('Hazard_Threat'):
+                if pd.isna(hazard_text):
+                    continue
+                # Convert to string and split hazards by common separators
+                for hazard in _RE_HAZARD_SPLIT.split(str(hazard_text)):
+                    clean_hazard = hazard.strip()
+                    if len(clean_hazard) > 5:
+                        all_hazards.append(clean_hazard.lower())
 
             # Count hazard occurrences
-            hazard_counts = {}
-            for hazard in all_hazards:
-                simple_hazard = hazard.lower().strip()
-                hazard_counts[simple_hazard] = hazard_counts.get(simple_hazard, 0) + 1
+            hazard_counts = Counter(all_hazards)
 
             # Get top hazards
-            sorted_hazards = sorted(hazard_counts.items(), key=lambda x: x[1], reverse=True)
-            top_hazards = [{"hazard": hazard, "count": count} for hazard, count in sorted_hazards[:10]]
-
-            # Categorize hazards
-            hazard_categories = {
-                "physical": ["falling", "slip", "trip", "pressure", "impact"],
-                "chemical": ["toxic", "chemical", "vapour", "fumes", "acid"],
-                "mechanical": ["equipment", "machinery", "vehicle", "tool"],
-                "environmental": ["weather", "temperature", "noise", "dust"]
-            }
+            top_counts = heapq.nlargest(10, hazard_counts.items(), key=itemgetter(1))
+            top_hazards = [{"hazard": hazard, "count": count} for hazard, count in top_counts]
 
-            category_counts = {}
-            for category, keywords in hazard_categories.items():
-                count = 0
-                for hazard in all_hazards:
-                    if any(keyword in hazard.lower() for keyword in keywords):
-                        count += 1
-                category_counts[category] = count
+            # Categorize hazards: each hazard counts once per category it mentions
+            category_hits = Counter()
+            for hazard in all_hazards:
+                category_hits.update({_HAZARD_KEYWORD_CATEGORY[keyword]
+                                      for keyword in _RE_HAZARD_KEYWORDS.findall(hazard)})
+            category_counts = {category: category_hits[category] for category in _HAZARD_CATEGORIES}
 
             return {
                 "common_hazards": top_hazards,
@@ -543,9 +683,10 @@ class RiskAssessmentKPIsExtractor:
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing common hazards: {str(e)}")
+            logger.error("Error analyzing common hazards: %s", e)
             return {"common_hazards": [], "total_hazards": 0, "error": str(e)}
 
+    @_cached_analysis
     def get_risk_matrix(self) -> Dict[str, Any]:
         """Generate risk matrix data for visualization"""
         try:
@@ -558,6 +699,10 @@ class RiskAssessmentKPIsExtractor:
 
             # Initialize matrix
             matrix_data = []
+            matrix_rows = list(zip(self._column('No'), self._column('Situation_Task'),
+                                   self._column('Initial_Risk'), self._column('Residual_Risk'),
+                                   self._initial_sev.tolist(), self._initial_like.tolist(),
+                                   self._residual_sev.tolist(), self._residual_like.tolist()))
 
             # Count risks in each cell
             for severity in severity_levels:
@@ -565,20 +710,18 @@ class RiskAssessmentKPIsExtractor:
                     count = 0
                     risks_in_cell = []
 
-                    for _, row in self.risk_data.iterrows():
-                        # Check both initial and residual risks
-                        initial_severity, initial_likelihood, _ = self._parse_risk_rating(row.get('Initial_Risk', ''))
-                        residual_severity, residual_likelihood, _ = self._parse_risk_rating(row.get('Residual_Risk', ''))
-
+                    for (assessment_no, situation, initial_risk, residual_risk,
+                         initial_severity, initial_likelihood,
+                         residual_severity, residual_likelihood) in matrix_rows:
                         # Count if either initial or residual risk matches this cell
                         if ((initial_severity == severity and initial_likelihood == likelihood) or
                             (residual_severity == severity and residual_likelihood == likelihood)):
                             count += 1
                             risks_in_cell.append({
-                                "assessment_no": row.get('No', ''),
-                                "situation": row.get('Situation_Task', ''),
-                                "initial_risk": row.get('Initial_Risk', ''),
-                                "residual_risk": row.get('Residual_Risk', '')
+                                "assessment_no": assessment_no,
+                                "situation": situation,
+                                "initial_risk": initial_risk,
+                                "residual_risk": residual_risk
                             })
 
                     # Determine risk level color
@@ -614,73 +757,73 @@ class RiskAssessmentKPIsExtractor:
             }
 
         except Exception as e:
-            logger.error(f"Error generating risk matrix: {str(e)}")
+            logger.error("Error generating risk matrix: %s", e)
             return {"matrix_data": [], "severity_levels": [], "likelihood_levels": [], "error": str(e)}
 
+    @_cached_analysis
     def get_measure_effectiveness(self) -> Dict[str, Any]:
         """Analyze effectiveness of control measures"""
         try:
             if self.risk_data.empty:
                 return {"effectiveness_metrics": {}, "overall_effectiveness": 0}
 
-            effectiveness_data = []
-            total_risk_reduction = 0
-            assessments_with_reduction = 0
-
-            for _, row in self.risk_data.iterrows():
-                initial_severity, initial_likelihood, _ = self._parse_risk_rating(row.get('Initial_Risk', ''))
-                residual_severity, residual_likelihood, _ = self._parse_risk_rating(row.get('Residual_Risk', ''))
-
-                if initial_severity > 0 and residual_severity > 0:
-                    # Calculate risk scores (simplified: severity * likelihood_numeric)
-                    likelihood_values = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5}
-
-                    initial_likelihood_val = likelihood_values.get(initial_likelihood, 3)
-                    residual_likelihood_val = likelihood_values.get(residual_likelihood, 3)
-
-                    initial_risk_score = initial_severity * initial_likelihood_val
-                    residual_risk_score = residual_severity * residual_likelihood_val
-
-                    risk_reduction = initial_risk_score - residual_risk_score
-                    reduction_percentage = (risk_reduction / initial_risk_score * 100) if initial_risk_score > 0 else 0
-
-                    effectiveness_data.append({
-                        "assessment_no": row.get('No', ''),
-                        "situation": row.get('Situation_Task', ''),
-                        "initial_risk_score": initial_risk_score,
-                        "residual_risk_score": residual_risk_score,
-                        "risk_reduction": risk_reduction,
-                        "reduction_percentage": reduction_percentage
-                    })
-
-                    total_risk_reduction += reduction_percentage
-                    assessments_with_reduction += 1
+            # Calculate risk scores (simplified: severity * likelihood_numeric)
+            initial_severities = self._initial_sev.to_numpy()
+            residual_severities = self._residual_sev.to_numpy()
+            initial_scores = initial_severities * self._likelihood_values(self._initial_like)
+            residual_scores = residual_severities * self._likelihood_values(self._residual_like)
+
+            analyzed = np.nonzero((initial_severities > 0) & (residual_severities > 0))[0]
+            initial_scores = initial_scores[analyzed]
+            residual_scores = residual_scores[analyzed]
+            risk_reductions = initial_scores - residual_scores
+            # Initial score is always positive here (severity > 0, likelihood >= 1)
+            reduction_percentages = risk_reductions / initial_scores * 100
+
+            assessment_nos = self._column('No')
+            situations = self._column('Situation_Task')
+
+            def effectiveness_rows(positions: np.ndarray) -> List[Dict[str, Any]]:
+                # Dicts are only built for the rows that end up in the response
+                return [
+                    {
+                        "assessment_no": assessment_nos[analyzed[k]],
+                        "situation": situations[analyzed[k]],
+                        "initial_risk_score": int(initial_scores[k]),
+                        "residual_risk_score": int(residual_scores[k]),
+                        "risk_reduction": int(risk_reductions[k]),
+                        "reduction_percentage": float(reduction_percentages[k])
+                    }
+                    for k in positions.tolist()
+                ]
+
+            total_analyzed = len(analyzed)
 
             # Calculate overall effectiveness
-            overall_effectiveness = (total_risk_reduction / assessments_with_reduction) if assessments_with_reduction > 0 else 0
+            overall_effectiveness = (sum(reduction_percentages.tolist()) / total_analyzed) if total_analyzed > 0 else 0
 
             # Categorize effectiveness
-            high_effectiveness = [item for item in effectiveness_data if item["reduction_percentage"] >= 50]
-            medium_effectiveness = [item for item in effectiveness_data if 25 <= item["reduction_percentage"] < 50]
-            low_effectiveness = [item for item in effectiveness_data if item["reduction_percentage"] < 25]
+            high_positions = np.nonzero(reduction_percentages >= 50)[0]
+            medium_count = int(np.count_nonzero((reduction_percentages >= 25) & (reduction_percentages < 50)))
+            low_positions = np.nonzero(reduction_percentages < 25)[0]
 
             return {
                 "effectiveness_metrics": {
                     "overall_effectiveness_percentage": overall_effectiveness,
-                    "high_effectiveness_count": len(high_effectiveness),
-                    "medium_effectiveness_count": len(medium_effectiveness),
-                    "low_effectiveness_count": len(low_effectiveness),
-                    "total_assessments_analyzed": len(effectiveness_data)
+                    "high_effectiveness_count": len(high_positions),
+                    "medium_effectiveness_count": medium_count,
+                    "low_effectiveness_count": len(low_positions),
+                    "total_assessments_analyzed": total_analyzed
                 },
                 "effectiveness_breakdown": {
-                    "high_effectiveness": high_effectiveness[:5],  # Top 5
-                    "low_effectiveness": low_effectiveness[:5]     # Bottom 5
+                    "high_effectiveness": effectiveness_rows(high_positions[:5]),  # Top 5
+                    "low_effectiveness": effectiveness_rows(low_positions[:5])     # Bottom 5
                 },
                 "overall_effectiveness": overall_effectiveness
             }
 
         except Exception as e:
-            logger.error(f"Error analyzing measure effectiveness: {str(e)}")
+            logger.error("Error analyzing measure effectiveness: %s", e)
             return {"effectiveness_metrics": {}, "overall_effectiveness": 0, "error": str(e)}
 
     def generate_insights(self) -> List[str]:
@@ -700,7 +843,7 @@ class RiskAssessmentKPIsExtractor:
             effectiveness = self.get_measure_effectiveness()
 
             # Generate insights
-            total_assessments = len(self.risk_data)
+            total_assessments = self._n
             insights.append(f"OVERVIEW: {total_assessments} risk assessments have been conducted")
 
             # Severity insights
@@ -737,7 +880,7 @@ class RiskAssessmentKPIsExtractor:
                     insights.append(f"ASSET PROTECTION: {asset_risk} assessments involve potential asset damage")
 
         except Exception as e:
-            logger.error(f"Error generating insights: {str(e)}")
+            logger.error("Error generating insights: %s", e)
             insights.append("Error generating insights - please check data quality")
 
         return insights
@@ -745,7 +888,7 @@ class RiskAssessmentKPIsExtractor:
     def get_risk_assessment_kpis(self, customer_id: Optional[str] = None, days_back: int = 365) -> Dict[str, Any]:
         """Get comprehensive risk assessment KPIs"""
         try:
-            logger.info(f"Generating risk assessment KPIs for customer: {customer_id}")
+            logger.info("Generating risk assessment KPIs for customer: %s", customer_id)
 
             # Get all KPI components
             assessments_count = self.get_number_of_assessments()
@@ -760,8 +903,8 @@ class RiskAssessmentKPIsExtractor:
             effectiveness = self.get_measure_effectiveness()
             insights = self.generate_insights()
 
-            # Convert numpy types for JSON serialization
-            result = convert_numpy_types({
+            # The analyses already return builtin types, so no convert_numpy_types pass is needed
+            result = {
                 # Main KPIs
                 "number_of_assessments": assessments_count["total_assessments"],
                 "severity_analysis": severity_analysis,
@@ -779,41 +922,32 @@ class RiskAssessmentKPIsExtractor:
 
                 # Metadata
                 "data_source": "risk_assessment_data.md",
-                "last_updated": datetime.now().isoformat(),
-                "total_assessments_analyzed": len(self.risk_data)
-            })
+                "last_updated": _now_iso(),
+                "total_assessments_analyzed": self._n
+            }
 
             logger.info("Risk assessment KPIs generated successfully")
             return result
 
         except Exception as e:
-            logger.error(f"Error getting risk assessment KPIs: {str(e)}")
-            return {
-                # Main KPIs (4 total)
-                "number_of_assessments": 0,
-                "severity_analysis": {"severity_distribution": {}, "average_severity": 0},
-                "likelihood_analysis": {"likelihood_distribution": {}, "most_common_likelihood": ""},
-                "hazard_effects": {"effects_distribution": {}, "total_effects": 0},
-
-                # Insights (5 total)
-                "common_control_measures": {"common_measures": [], "total_measures": 0},
-                "common_recovery_measures": {"recovery_measures": [], "total_measures": 0},
-                "high_residual_risk_activities": {"high_risk_activities": [], "total_high_risk": 0},
-                "common_hazards": {"common_hazards": [], "total_hazards": 0},
-                "measure_effectiveness": {"effectiveness_metrics": {}, "overall_effectiveness": 0},
-                "insights": ["Error generating KPIs - please check data availability"],
-
-                # Metadata
-                "error": str(e),
-                "data_source": "risk_assessment_data.md",
-                "last_updated": datetime.now().isoformat()
-            }
+            logger.error("Error getting risk assessment KPIs: %s", e)
+            return {**_EMPTY_KPI_TEMPLATE, "error": str(e), "last_updated": _now_iso()}
 
     def close(self):
         """Close any resources (placeholder for consistency with other extractors)"""
         pass
 
 
+# Process-wide extractor behind the utility function; the lock serializes reloads and KPI runs on it
+_shared_extractor_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _shared_extractor() -> RiskAssessmentKPIsExtractor:
+    """Extractor reused by every get_risk_assessment_kpis() call in this process"""
+    return RiskAssessmentKPIsExtractor()
+
+
 # Utility function for easy usage
 def get_risk_assessment_kpis(customer_id: Optional[str] = None, days_back: int = 365) -> Dict[str, Any]:
     """
@@ -827,15 +961,26 @@ def get_risk_assessment_kpis(customer_id: Optional[str] = None, days_back: int =
         Dictionary containing all risk assessment KPIs
     """
     try:
-        # Create extractor and get KPIs
-        extractor = RiskAssessmentKPIsExtractor()
-        kpis = extractor.get_risk_assessment_kpis(customer_id, days_back)
-
-        # Close the extractor
-        extractor.close()
+        # Reuse the last result while the markdown file is unchanged
+        cache_key = os.path.abspath(RISK_DATA_FILE_PATH)
+        file_key = _file_signature(RISK_DATA_FILE_PATH)
+        cached = _KPI_CACHE.get(cache_key)
+        if file_key is not None and cached is not None and cached[0] == file_key:
+            kpis = copy.deepcopy(cached[1])
+            kpis["last_updated"] = _now_iso()
+            return kpis
+
+        # The file changed (or this is the first call): refresh the shared extractor and get KPIs
+        with _shared_extractor_lock:
+            extractor = _shared_extractor()
+            extractor._load_risk_data()
+            kpis = extractor.get_risk_assessment_kpis(customer_id, days_back)
+
+        if file_key is not None and "error" not in kpis and kpis.get("total_assessments_analyzed"):
+            _KPI_CACHE[cache_key] = (file_key, copy.deepcopy(kpis))
 
         return kpis
 
     except Exception as e:
-        logger.error(f"Error in standalone get_risk_assessment_kpis: {str(e)}")
+        logger.error("Error in standalone get_risk_assessment_kpis: %s", e)
         return {"error": str(e)}
@@ -3,33 +3,44 @@ Main Application for SafetyConnect Dashboard KPIs
 Orchestrates data extraction for the 4 core safety modules dashboard KPIs
 """
 
+import atexit
 import logging
-from typing import Optional
-
-from data_extractors.incident_kpis import IncidentKPIsExtractor
-from data_extractors.actiontracking_kpis import ActionTrackingKPIsExtractor
-from data_extractors.driver_safety_checklist_kpis_extractor import DriverSafetyChecklistKPIsExtractor
-from data_extractors.observation_tracker_kpis_extractor import ObservationTrackerKPIsExtractor
-from data_extractors.equipment_asset_kpis_extractor import EquipmentAssetKPIsExtractor
-from data_extractors.employee_training_kpis_extractor import EmployeeTrainingKPIsExtractor
-from data_extractors.risk_assessment_kpis_extractor import RiskAssessmentKPIsExtractor
-from ai_engine.summarization_engine import SafetySummarizationEngine
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
 from config.database_config import db_manager
 
-# Configure logging
+# Configure logging; set AI_SUMMARIZER_LOG_FILE="" (e.g. under multiple uvicorn workers) to skip the file handler.
+# Records are queued and written by a background QueueListener so request threads never block on log I/O
+log_handlers = [logging.StreamHandler()]
+log_file = os.getenv("AI_SUMMARIZER_LOG_FILE", "ai_summarizer.log")
+if log_file:
+    # Open the file on first record; the listener thread does the writes
+    log_handlers.insert(0, logging.FileHandler(log_file, delay=True))
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *log_handlers)
+_log_listener.start()
+# Drain the queue at exit so no records are lost
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ai_summarizer.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 class SafetySummarizerApp:
     """Main application class for SafetyConnect Dashboard KPIs"""
 
+    _instance: Optional["SafetySummarizerApp"] = None
+    _instance_lock = threading.Lock()
+
     def __init__(self, openai_api_key: Optional[str] = None):
         """
         Initialize the SafetyConnect Application
@@ -37,48 +48,110 @@ class SafetySummarizerApp:
         Args:
             openai_api_key: OpenAI API key for AI summarization
         """
+        # Set only once __init__ completes; close/cleanup are no-ops before that
+        self._initialized = False
         logger.info("Initializing SafetyConnect Dashboard Application")
 
-        # Initialize all 7 core KPI extractors
-        # Note: All extractors that use database sessions will share the same session for consistency
+        # Initialize the database-backed extractors; the rest and the AI engine are lazy
+        # Note: These extractors use the thread-local db_manager.Session, so each thread gets its own session
+        self._openai_api_key = openai_api_key
+        self._lazy_components: Dict[str, Any] = {}
+        self._lazy_lock = threading.Lock()
+        # (name, extractor) pairs to close on shutdown; lazy extractors register when created
+        self._closables: List[Tuple[str, Any]] = []
+
         try:
-            self.db_session = db_manager.get_process_safety_session()
+            from data_extractors.incident_kpis import IncidentKPIsExtractor
+            from data_extractors.actiontracking_kpis import ActionTrackingKPIsExtractor
+            from data_extractors.observation_tracker_kpis_extractor import ObservationTrackerKPIsExtractor
 
-            # Initialize extractors that use database sessions with shared session
+            # Validate this thread's session now (with retries) so connection problems surface at startup
+            self.db_session = db_manager.get_scoped_session()
+
+            # Initialize extractors that use database sessions with the scoped session
             self.incident_extractor = IncidentKPIsExtractor(self.db_session)
             self.action_extractor = ActionTrackingKPIsExtractor(self.db_session)
             self.observation_tracker_extractor = ObservationTrackerKPIsExtractor(self.db_session)
+            self._closables.append(("observation_tracker_extractor", self.observation_tracker_extractor))
 
-            # Initialize extractors that create their own sessions
-            self.driver_safety_extractor = DriverSafetyChecklistKPIsExtractor()
-            self.equipment_asset_extractor = EquipmentAssetKPIsExtractor()
-            self.employee_training_extractor = EmployeeTrainingKPIsExtractor()
-            self.risk_assessment_extractor = RiskAssessmentKPIsExtractor()
-
-            # Initialize AI engine for conversational AI
-            self.ai_engine = SafetySummarizationEngine(api_key=openai_api_key)
-
+            self._initialized = True
             logger.info("SafetyConnect Dashboard Application initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize SafetyConnect Dashboard Application: {str(e)}")
+            logger.error("Failed to initialize SafetyConnect Dashboard Application: %s", e)
+            # Don't leave a half-open session in this thread's registry
+            db_manager.Session.remove()
             raise
 
+    @classmethod
+    def instance(cls, openai_api_key: Optional[str] = None) -> "SafetySummarizerApp":
+        """Process-wide application, created on first call so the DB session and AI client are set up once"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(openai_api_key=openai_api_key)
+        return cls._instance
+
+    def _get_lazy_component(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Return the named component, creating it with factory() on first access"""
+        component = self._lazy_components.get(name)
+        if component is None:
+            with self._lazy_lock:
+                component = self._lazy_components.get(name)
+                if component is None:
+                    logger.info("Initializing %s", name)
+                    component = factory()
+                    self._lazy_components[name] = component
+                    if hasattr(component, 'close'):
+                        self._closables.append((name, component))
+        return component
+
+    @property
+    def driver_safety_extractor(self):
+        """Driver safety checklist extractor (creates its own session)"""
+        def create():
+            from data_extractors.driver_safety_checklist_kpis_extractor import DriverSafetyChecklistKPIsExtractor
+            return DriverSafetyChecklistKPIsExtractor()
+        return self._get_lazy_component("driver_safety_extractor", create)
+
+    @property
+    def equipment_asset_extractor(self):
+        """Equipment asset extractor (markdown data)"""
+        def create():
+            from data_extractors.equipment_asset_kpis_extractor import EquipmentAssetKPIsExtractor
+            return EquipmentAssetKPIsExtractor()
+        return self._get_lazy_component("equipment_asset_extractor", create)
+
+    @property
+    def employee_training_extractor(self):
+        """Employee training and fitness extractor (markdown data)"""
+        def create():
+            from data_extractors.employee_training_kpis_extractor import EmployeeTrainingKPIsExtractor
+            return EmployeeTrainingKPIsExtractor()
+        return self._get_lazy_component("employee_training_extractor", create)
+
+    @property
+    def risk_assessment_extractor(self):
+        """Risk assessment extractor (markdown data)"""
+        def create():
+            from data_extractors.risk_assessment_kpis_extractor import RiskAssessmentKPIsExtractor
+            return RiskAssessmentKPIsExtractor()
+        return self._get_lazy_component("risk_assessment_extractor", create)
+
+    @property
+    def ai_engine(self):
+        """AI engine for summaries and conversational AI"""
+        def create():
+            from ai_engine.summarization_engine import SafetySummarizationEngine
+            return SafetySummarizationEngine(api_key=self._openai_api_key)
+        return self._get_lazy_component("ai_engine", create)
+
     def recreate_database_sessions(self):
         """Recreate database sessions for extractors that need them"""
         try:
             logger.info("Recreating database sessions for extractors")
 
-            # Clean up existing session if it exists
-            if hasattr(self, 'db_session') and self.db_session:
-                db_manager.cleanup_session(self.db_session)
-
-            # Get fresh session with validation
-            self.db_session = db_manager.create_fresh_session()
-
-            # Update all extractors that use database sessions with new session
-            self.incident_extractor.db_session = self.db_session
-            self.action_extractor.db_session = self.db_session
-            self.observation_tracker_extractor.db_session = self.db_session
+            # Extractors hold the scoped registry, so dropping this thread's session is enough
+            db_manager.Session.remove()
 
             # Validate the new session
             if db_manager.validate_session(self.db_session):
@@ -88,79 +161,61 @@ class SafetySummarizerApp:
                 logger.error("Database session validation failed after recreation")
                 return False
         except Exception as e:
-            logger.error(f"Failed to recreate database sessions: {str(e)}")
+            logger.error("Failed to recreate database sessions: %s", e)
             return False
 
+    def _close_registered(self):
+        """Close every registered extractor; one failing close must not skip the rest"""
+        for name, extractor in self._closables:
+            try:
+                extractor.close()
+            except Exception as e:
+                logger.warning("Error closing %s: %s", name, e)
+
     def cleanup_database_sessions(self):
         """Clean up all database sessions"""
+        if not getattr(self, '_initialized', False):
+            return
+
         try:
             logger.info("Cleaning up database sessions")
 
-            # Clean up main session
-            if hasattr(self, 'db_session') and self.db_session:
-                db_manager.cleanup_session(self.db_session)
-                self.db_session = None
-
-            # Clean up extractor sessions that manage their own sessions
-            extractors_with_cleanup = [
-                self.driver_safety_extractor,
-                self.equipment_asset_extractor,
-                self.employee_training_extractor,
-                self.risk_assessment_extractor
-            ]
-
-            for extractor in extractors_with_cleanup:
-                if hasattr(extractor, 'close'):
-                    try:
-                        extractor.close()
-                    except Exception as e:
-                        logger.warning(f"Error closing extractor session: {str(e)}")
+            # Clean up this thread's session
+            db_manager.Session.remove()
+
+            # Clean up extractor sessions that manage their own sessions (only those created so far)
+            self._close_registered()
 
             logger.info("Database sessions cleaned up successfully")
 
         except Exception as e:
-            logger.error(f"Error during database session cleanup: {str(e)}")
+            logger.error("Error during database session cleanup: %s", e)
 
     def close(self):
         """Close database connections"""
-        logger.info("Closing database connections")
-
-        # Close individual extractor sessions
-        if hasattr(self, 'db_session') and self.db_session:
-            try:
-                self.db_session.close()
-            except Exception as e:
-                logger.warning(f"Error closing main db_session: {str(e)}")
+        if not getattr(self, '_initialized', False):
+            return
 
-        if hasattr(self, 'driver_safety_extractor'):
-            try:
-                self.driver_safety_extractor.close()
-            except Exception as e:
-                logger.warning(f"Error closing driver_safety_extractor: {str(e)}")
-
-        if hasattr(self, 'observation_tracker_extractor'):
-            try:
-                self.observation_tracker_extractor.close()
-            except Exception as e:
-                logger.warning(f"Error closing observation_tracker_extractor: {str(e)}")
+        logger.info("Closing database connections")
 
-        if hasattr(self, 'equipment_asset_extractor'):
+        try:
+            # Close individual extractor sessions
             try:
-                self.equipment_asset_extractor.close()
+                db_manager.Session.remove()
             except Exception as e:
-                logger.warning(f"Error closing equipment_asset_extractor: {str(e)}")
+                logger.warning("Error closing main db_session: %s", e)
 
-        if hasattr(self, 'employee_training_extractor'):
+            self._close_registered()
+        finally:
+            # Always dispose the engine pool, even if closing a session failed
             try:
-                self.employee_training_extractor.close()
+                db_manager.close_connections()
             except Exception as e:
-                logger.warning(f"Error closing employee_training_extractor: {str(e)}")
+                logger.warning("Error closing database manager connections: %s", e)
 
-        # Close the database manager connections
-        try:
-            db_manager.close_connections()
-        except Exception as e:
-            logger.warning(f"Error closing database manager connections: {str(e)}")
+def get_app(openai_api_key: Optional[str] = None) -> SafetySummarizerApp:
+    """Process-wide SafetySummarizerApp shared by the API and CLI entry points"""
+    return SafetySummarizerApp.instance(openai_api_key)
 
 def main():
     """Main function for command-line usage"""
@@ -176,13 +231,13 @@ def main():
     print("\nUse the web API endpoints to access KPI data and AI insights.")
     print("Start the server with: python run_server.py")
 
-    app = SafetySummarizerApp()
+    app = get_app()
 
     try:
         logger.info("SafetyConnect application ready")
         print("✅ Application ready for API requests.")
     except Exception as e:
-        logger.error(f"Application error: {str(e)}")
+        logger.error("Application error: %s", e)
         return 1
     finally:
         app.close()
@@ -13,18 +13,37 @@ current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 def main():
-    """Run the API server"""
+    """Run the API server
+
+    Environment: API_HOST, API_PORT, API_RELOAD, API_WORKERS, API_ENV, LOG_LEVEL
+    """
     
     # Configuration
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "9000"))
-    reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    reload = os.getenv("API_RELOAD", "false").lower() == "true"
     log_level = os.getenv("LOG_LEVEL", "info").lower()
+    production = os.getenv("API_ENV", "").lower() == "production"
+    if production:
+        reload = False
+
+    # uvicorn only supports a single worker in reload mode
+    default_workers = (os.cpu_count() or 1) if production else 1
+    workers = 1 if reload else int(os.getenv("API_WORKERS", default_workers))
+
+    # Watch only the server sources when reloading and skip what the server itself writes (logs, saved dashboards/charts); exclusion patterns need watchfiles installed
+    reload_options = {}
+    if reload:
+        reload_options = {
+            "reload_dirs": [str(current_dir)],
+            "reload_excludes": ["*.log", "__pycache__/*", "dashboards/*", "custom_charts/*"],
+        }
     
     print(f"Starting SafetyConnect Dashboard API Server...")
     print(f"Host: {host}")
     print(f"Port: {port}")
     print(f"Reload: {reload}")
+    print(f"Workers: {workers}")
     print(f"Log Level: {log_level}")
     print(f"API Documentation: http://{host}:{port}/docs")
     print("-" * 50)
@@ -35,6 +54,13 @@ def main():
         host=host,
         port=port,
         reload=reload,
+        workers=workers,
+        **reload_options,
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard])
+        loop="auto",
+        http="auto",
+        backlog=2048,
+        timeout_keep_alive=30,
         log_level=log_level,
         access_log=True
     )
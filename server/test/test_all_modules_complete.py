@@ -9,20 +9,59 @@ Modules:
 4. Action Tracking (SubTagId filtering)
 """
 
+import io
 import json
 import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-# Import all test functions
-from test_incident_investigation_kpis import test_incident_investigation_kpis
-from test_driver_safety_checklist_kpis import test_driver_safety_checklist_kpis
-from test_observation_tracker_kpis import test_observation_tracker_kpis
-from test_action_tracking_kpis import test_action_tracking_kpis
+# Import the test modules (not their functions) so pytest doesn't collect and run each module test here again
+import test_incident_investigation_kpis as incident_investigation_test
+import test_driver_safety_checklist_kpis as driver_safety_checklist_test
+import test_observation_tracker_kpis as observation_tracker_test
+import test_action_tracking_kpis as action_tracking_test
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# (result key, section title, test function) for each module, in display order
+MODULE_TESTS = (
+    ('incident_investigation', "🔍 MODULE 1: INCIDENT INVESTIGATION", incident_investigation_test.test_incident_investigation_kpis),
+    ('driver_safety_checklists', "🚗 MODULE 2: DRIVER SAFETY CHECKLISTS", driver_safety_checklist_test.test_driver_safety_checklist_kpis),
+    ('observation_tracker', "🔍 MODULE 3: OBSERVATION TRACKER", observation_tracker_test.test_observation_tracker_kpis),
+    ('action_tracking', "🚀 MODULE 4: ACTION TRACKING", action_tracking_test.test_action_tracking_kpis)
+)
+
+class _ThreadBufferedStdout:
+    """sys.stdout stand-in that collects output from capturing threads separately"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return self.stream.isatty()
+
+    def capture(self, func):
+        """Call func, returning (result, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            result = func()
+            return result, self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
 def test_all_safety_modules():
     """
     Test all 4 safety modules and show complete response structures
@@ -33,27 +72,26 @@ def test_all_safety_modules():
     print("=" * 80)
     
     all_results = {}
+    failed_modules = []
     
     try:
-        # Test Module 1: Incident Investigation
-        print("\n" + "🔍 MODULE 1: INCIDENT INVESTIGATION" + "\n" + "=" * 50)
-        incident_result = test_incident_investigation_kpis()
-        all_results['incident_investigation'] = incident_result
-        
-        # Test Module 2: Driver Safety Checklists
-        print("\n" + "🚗 MODULE 2: DRIVER SAFETY CHECKLISTS" + "\n" + "=" * 50)
-        driver_safety_result = test_driver_safety_checklist_kpis()
-        all_results['driver_safety_checklists'] = driver_safety_result
-        
-        # Test Module 3: Observation Tracker
-        print("\n" + "🔍 MODULE 3: OBSERVATION TRACKER" + "\n" + "=" * 50)
-        observation_result = test_observation_tracker_kpis()
-        all_results['observation_tracker'] = observation_result
-        
-        # Test Module 4: Action Tracking
-        print("\n" + "🚀 MODULE 4: ACTION TRACKING" + "\n" + "=" * 50)
-        action_tracking_result = test_action_tracking_kpis()
-        all_results['action_tracking'] = action_tracking_result
+        # Run the module tests concurrently; each test's output is buffered and printed in module order
+        stdout = _ThreadBufferedStdout(sys.stdout)
+        sys.stdout = stdout
+        try:
+            with ThreadPoolExecutor(max_workers=len(MODULE_TESTS)) as executor:
+                futures = {name: executor.submit(stdout.capture, test_func) for name, _, test_func in MODULE_TESTS}
+                captured = {name: future.result() for name, future in futures.items()}
+        finally:
+            sys.stdout = stdout.stream
+
+        for module_name, title, _ in MODULE_TESTS:
+            result, output = captured[module_name]
+            print("\n" + title + "\n" + "=" * 50)
+            print(output, end="")
+            all_results[module_name] = result
+            if isinstance(result, dict) and "error" in result:
+                failed_modules.append(module_name)
         
         # Summary of all modules
         print("\n" + "📊 COMPLETE FRONTEND RESPONSE STRUCTURE" + "\n" + "=" * 80)
@@ -80,23 +118,25 @@ def test_all_safety_modules():
                     "observation_tracker": "9bb83f61-b869-4721-81b6-0c870e91a779"
                 }
             },
-            "status": "success" if all(not ("error" in result) for result in all_results.values()) else "partial_success"
+            "status": "success" if not failed_modules else "partial_success"
         }
         
-        # Pretty print the complete response
-        response_json = json.dumps(complete_response, indent=2, default=str)
-        print(response_json)
+        # Pretty print the complete response (skipped when nobody is watching, e.g. CI)
+        if os.environ.get("TEST_VERBOSE") or sys.stdout.isatty():
+            print(json.dumps(complete_response, indent=2, default=str))
+        else:
+            print(f"(response has {len(complete_response)} top-level keys; set TEST_VERBOSE=1 to print it)")
         
         print("\n" + "📋 FRONTEND INTEGRATION SUMMARY" + "\n" + "=" * 80)
         
         # Module status summary
-        for module_name, result in all_results.items():
-            status = "✅ SUCCESS" if "error" not in result else "❌ ERROR"
+        for module_name in all_results:
+            status = "❌ ERROR" if module_name in failed_modules else "✅ SUCCESS"
             print(f"{module_name.upper().replace('_', ' ')}: {status}")
         
         print(f"\nTOTAL MODULES: 4")
-        print(f"SUCCESSFUL MODULES: {sum(1 for result in all_results.values() if 'error' not in result)}")
-        print(f"FAILED MODULES: {sum(1 for result in all_results.values() if 'error' in result)}")
+        print(f"SUCCESSFUL MODULES: {len(all_results) - len(failed_modules)}")
+        print(f"FAILED MODULES: {len(failed_modules)}")
         
         print("\n" + "🎯 KEY FRONTEND INTEGRATION POINTS:" + "\n" + "-" * 50)
         print("• All response structures are consistent and ready for consumption")
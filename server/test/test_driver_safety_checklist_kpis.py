@@ -7,120 +7,122 @@ Template ID: 'a35be57e-dd36-4a21-b05b-e4d4fa836f53'
 KPIs: Daily/Weekly completion percentages, Vehicle fitness assessment, Overdue drivers
 """
 
+import io
 import json
 import logging
+import os
+import sys
 from datetime import datetime, timedelta
+from functools import partial
+from operator import itemgetter
 from data_extractors.driver_safety_checklist_kpis_extractor import get_driver_safety_checklist_kpis
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_HR = "=" * 60
+
+# Closing notes printed after the response summary
+_FRONTEND_NOTES = """🎯 FRONTEND INTEGRATION NOTES:
+============================================================
+• This response structure is ready for frontend consumption
+• Daily/Weekly breakdowns provide time-series data for charts
+• Vehicle fitness analysis includes AI-based assessment
+• Overdue drivers insight helps identify compliance issues
+• Summary section provides quick overview metrics
+• All percentages are calculated and ready for display
+• Date ranges are in ISO format for easy parsing"""
+
+# (heading, response key, scalar fields, (list field, unit) pairs) for the response summary, in display order
+_SUMMARY_SECTIONS = (
+    ("📈 DAILY COMPLETION STATS:", 'daily_completion_stats',
+     ('total_completed_checklists', 'average_daily_completion', 'total_days_analyzed'),
+     (('daily_breakdown', 'days'),)),
+    ("📊 WEEKLY COMPLETION STATS:", 'weekly_completion_stats',
+     ('total_completed_checklists', 'average_weekly_completion', 'total_weeks_analyzed'),
+     (('weekly_breakdown', 'weeks'),)),
+    ("🚛 VEHICLE FITNESS ANALYSIS:", 'vehicle_fitness_analysis',
+     ('total_vehicles_inspected', 'vehicles_deemed_unfit', 'vehicles_deemed_fit', 'unfit_percentage'),
+     (('unfit_vehicles_details', 'vehicles'), ('fit_vehicles_details', 'vehicles'))),
+    ("⚠️ OVERDUE DRIVERS INSIGHT:", 'overdue_drivers_insight',
+     ('total_overdue_drivers', 'overdue_schedules_count', 'overdue_histories_count'),
+     (('overdue_drivers_list', 'drivers'),)),
+    ("📊 SUMMARY METRICS:", 'summary',
+     ('total_daily_completions', 'average_daily_completion', 'total_weekly_completions', 'average_weekly_completion',
+      'total_vehicles_inspected', 'vehicles_deemed_unfit', 'unfit_percentage', 'total_overdue_drivers',
+      'overdue_schedules_count', 'overdue_histories_count'),
+     ())
+)
+
 def test_driver_safety_checklist_kpis():
     """
     Test the Driver Safety Checklist KPIs extractor and show complete response structure
     """
-    print("🚗 Testing Driver Safety Checklist KPIs Module...")
-    print("=" * 60)
+    # Collect the report in memory and write it to stdout once at the end
+    buf = io.StringIO()
+    out = partial(print, file=buf)
+
+    out("🚗 Testing Driver Safety Checklist KPIs Module...")
+    out(_HR)
     
     try:
         # Test parameters
         customer_id = None  # Test with all customers
         days_back = 365  # Last 365 days (default)
         
-        print(f"📅 Date Range: Last {days_back} days (365 days default)")
-        print(f"👤 Customer ID: {customer_id or 'All customers'}")
-        print(f"🎯 Template ID: a35be57e-dd36-4a21-b05b-e4d4fa836f53")
-        print()
+        out(f"📅 Date Range: Last {days_back} days (365 days default)")
+        out(f"👤 Customer ID: {customer_id or 'All customers'}")
+        out(f"🎯 Template ID: a35be57e-dd36-4a21-b05b-e4d4fa836f53")
+        out()
         
         # Extract KPIs
-        print("🚀 Extracting Driver Safety Checklist KPIs...")
+        out("🚀 Extracting Driver Safety Checklist KPIs...")
         kpis_response = get_driver_safety_checklist_kpis(customer_id, days_back)
         
         # Display results
-        print("✅ Driver Safety Checklist KPIs extracted successfully!")
-        print()
-        print("📊 COMPLETE RESPONSE STRUCTURE FOR FRONTEND:")
-        print("=" * 60)
+        out("✅ Driver Safety Checklist KPIs extracted successfully!")
+        out()
+        out("📊 COMPLETE RESPONSE STRUCTURE FOR FRONTEND:")
+        out(_HR)
         
-        # Pretty print the complete response structure
-        response_json = json.dumps(kpis_response, indent=2, default=str)
-        print(response_json)
+        # Pretty print the complete response structure (skipped when nobody is watching, e.g. CI)
+        if os.environ.get("TEST_VERBOSE") or sys.stdout.isatty():
+            out(json.dumps(kpis_response, indent=2, default=str))
+        else:
+            out(f"(response has {len(kpis_response)} top-level keys; set TEST_VERBOSE=1 to print it)")
         
-        print()
-        print("📋 SUMMARY OF RESPONSE STRUCTURE:")
-        print("=" * 60)
+        out()
+        out("📋 SUMMARY OF RESPONSE STRUCTURE:")
+        out(_HR)
         
         # Template Information
-        print("🎯 TEMPLATE INFORMATION:")
-        print(f"  - template_id: {kpis_response.get('template_id', 'N/A')}")
-        print(f"  - template_name: {kpis_response.get('template_name', 'N/A')}")
-        
-        print()
-        print("📈 DAILY COMPLETION STATS:")
-        daily_stats = kpis_response.get('daily_completion_stats', {})
-        print(f"  - total_completed_checklists: {daily_stats.get('total_completed_checklists', 0)}")
-        print(f"  - average_daily_completion: {daily_stats.get('average_daily_completion', 0)}")
-        print(f"  - total_days_analyzed: {daily_stats.get('total_days_analyzed', 0)}")
-        print(f"  - daily_breakdown: {len(daily_stats.get('daily_breakdown', []))} days")
-        
-        print()
-        print("📊 WEEKLY COMPLETION STATS:")
-        weekly_stats = kpis_response.get('weekly_completion_stats', {})
-        print(f"  - total_completed_checklists: {weekly_stats.get('total_completed_checklists', 0)}")
-        print(f"  - average_weekly_completion: {weekly_stats.get('average_weekly_completion', 0)}")
-        print(f"  - total_weeks_analyzed: {weekly_stats.get('total_weeks_analyzed', 0)}")
-        print(f"  - weekly_breakdown: {len(weekly_stats.get('weekly_breakdown', []))} weeks")
-        
-        print()
-        print("🚛 VEHICLE FITNESS ANALYSIS:")
-        fitness_analysis = kpis_response.get('vehicle_fitness_analysis', {})
-        print(f"  - total_vehicles_inspected: {fitness_analysis.get('total_vehicles_inspected', 0)}")
-        print(f"  - vehicles_deemed_unfit: {fitness_analysis.get('vehicles_deemed_unfit', 0)}")
-        print(f"  - vehicles_deemed_fit: {fitness_analysis.get('vehicles_deemed_fit', 0)}")
-        print(f"  - unfit_percentage: {fitness_analysis.get('unfit_percentage', 0)}%")
-        print(f"  - unfit_vehicles_details: {len(fitness_analysis.get('unfit_vehicles_details', []))} vehicles")
-        print(f"  - fit_vehicles_details: {len(fitness_analysis.get('fit_vehicles_details', []))} vehicles")
-        
-        print()
-        print("⚠️ OVERDUE DRIVERS INSIGHT:")
-        overdue_insight = kpis_response.get('overdue_drivers_insight', {})
-        print(f"  - total_overdue_drivers: {overdue_insight.get('total_overdue_drivers', 0)}")
-        print(f"  - overdue_schedules_count: {overdue_insight.get('overdue_schedules_count', 0)}")
-        print(f"  - overdue_histories_count: {overdue_insight.get('overdue_histories_count', 0)}")
-        print(f"  - overdue_drivers_list: {len(overdue_insight.get('overdue_drivers_list', []))} drivers")
+        out("🎯 TEMPLATE INFORMATION:")
+        out(f"  - template_id: {kpis_response.get('template_id', 'N/A')}")
+        out(f"  - template_name: {kpis_response.get('template_name', 'N/A')}")
         
-        print()
-        print("📊 SUMMARY METRICS:")
-        summary = kpis_response.get('summary', {})
-        print(f"  - total_daily_completions: {summary.get('total_daily_completions', 0)}")
-        print(f"  - average_daily_completion: {summary.get('average_daily_completion', 0)}")
-        print(f"  - total_weekly_completions: {summary.get('total_weekly_completions', 0)}")
-        print(f"  - average_weekly_completion: {summary.get('average_weekly_completion', 0)}")
-        print(f"  - total_vehicles_inspected: {summary.get('total_vehicles_inspected', 0)}")
-        print(f"  - vehicles_deemed_unfit: {summary.get('vehicles_deemed_unfit', 0)}")
-        print(f"  - unfit_percentage: {summary.get('unfit_percentage', 0)}%")
-        print(f"  - total_overdue_drivers: {summary.get('total_overdue_drivers', 0)}")
-        print(f"  - overdue_schedules_count: {summary.get('overdue_schedules_count', 0)}")
-        print(f"  - overdue_histories_count: {summary.get('overdue_histories_count', 0)}")
+        for heading, section_key, fields, list_fields in _SUMMARY_SECTIONS:
+            out()
+            out(heading)
+            stats = kpis_response.get(section_key) or {}
+            values = itemgetter(*fields)({**dict.fromkeys(fields, 0), **stats})
+            for field, value in zip(fields, values):
+                out(f"  - {field}: {value}{'%' if field.endswith('_percentage') else ''}")
+            for field, unit in list_fields:
+                out(f"  - {field}: {len(stats.get(field) or [])} {unit}")
         
-        print()
-        print("🎯 FRONTEND INTEGRATION NOTES:")
-        print("=" * 60)
-        print("• This response structure is ready for frontend consumption")
-        print("• Daily/Weekly breakdowns provide time-series data for charts")
-        print("• Vehicle fitness analysis includes AI-based assessment")
-        print("• Overdue drivers insight helps identify compliance issues")
-        print("• Summary section provides quick overview metrics")
-        print("• All percentages are calculated and ready for display")
-        print("• Date ranges are in ISO format for easy parsing")
+        out()
+        out(_FRONTEND_NOTES)
         
         return kpis_response
         
     except Exception as e:
         logger.error(f"❌ Error testing Driver Safety Checklist KPIs: {str(e)}")
-        print(f"❌ Error: {str(e)}")
+        out(f"❌ Error: {str(e)}")
         return {"error": str(e)}
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 if __name__ == "__main__":
     """Run the test"""